@@ -0,0 +1,195 @@
+"""Prebuilt, pre-scaled texture variants.
+
+The source PNGs are much larger than they are ever drawn (backgrounds are
+1536x1024, the player frames 1024x1024), so at runtime every sprite is
+decoded at full size and then scaled down. The build step does this once
+per target resolution and stores each variant as raw pixels (see
+``raw_pixels``) in ``asset_cache/``. ``manifest.json`` records every source's sha256 and the
+variants built from it, so a rebuild only touches changed files.
+
+At runtime ``SpriteCache`` asks ``ASSET_CACHE.lookup(path, size)`` first and
+falls back to the PNG when there is no variant or the source changed since
+the build (checked by mtime and file size).
+
+Usage::
+
+    python asset_cache.py --width 1920 --width 1366   # build variants
+    python asset_cache.py --width 1920 --force        # rebuild everything
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+import pygame
+
+from raw_pixels import write_raw
+from save_writer import write_json_atomic
+
+Size = Tuple[int, int]
+
+CACHE_DIR = "asset_cache"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 2
+BACKGROUNDS_GLOB = "sprites/backgrounds/*.png"
+
+
+def screen_geometry(width: int) -> Tuple[int, int, float]:
+    """Window height and scale for a display ``width``, computed as in render.py."""
+    height = int(width / 16 * 9)
+    return width, height, height / 279
+
+
+def icon_sizes(width: int) -> List[Size]:
+    """Sizes of word icons (under dialog words and in the inventory), computed as in render.py."""
+    from inventory_view import InventoryView
+
+    w, h, _ = screen_geometry(width)
+    pygame.font.init()
+    font_h = pygame.font.SysFont("consolas", int(h / 20)).get_height()
+    item_size = InventoryView.grid((w, h), font_h)[0]
+    return [(font_h, font_h), (item_size, item_size)]
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def size_key(size: Size) -> str:
+    return f"{size[0]}x{size[1]}"
+
+
+class AssetCache:
+    def __init__(self, directory: str = CACHE_DIR):
+        self.directory = directory
+        self._sources: Optional[Dict[str, Dict[str, object]]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, MANIFEST_NAME)
+
+    def _manifest_sources(self) -> Dict[str, Dict[str, object]]:
+        with self._lock:
+            if self._sources is None:
+                try:
+                    with open(self.manifest_path, "r", encoding="utf-8") as f:
+                        manifest = json.load(f)
+                    ok = manifest.get("version") == MANIFEST_VERSION
+                    self._sources = manifest.get("sources", {}) if ok else {}
+                except (OSError, ValueError):
+                    self._sources = {}
+            return self._sources
+
+    def reload(self) -> None:
+        """Forget the loaded manifest; it is re-read on the next lookup."""
+        with self._lock:
+            self._sources = None
+
+    def lookup(self, path: str, size: Size) -> Optional[str]:
+        """Path of the prebuilt ``size`` variant of ``path``, or None if there is none or it is stale."""
+        entry = self._manifest_sources().get(path)
+        if entry is None:
+            return None
+        name = entry["variants"].get(size_key(size))
+        if name is None:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if st.st_mtime_ns != entry["mtime_ns"] or st.st_size != entry["bytes"]:
+            return None
+        variant = os.path.join(self.directory, name)
+        return variant if os.path.exists(variant) else None
+
+
+ASSET_CACHE = AssetCache()
+
+
+# ---------- build ----------
+
+def wanted_variants(widths: List[int]) -> Dict[str, Set[Size]]:
+    """Every (texture, on-screen size) the scenes need at the given display widths."""
+    from asset_preloader import scene_assets
+    from scenes import scenes
+
+    wanted: Dict[str, Set[Size]] = {}
+    for width in widths:
+        w, h, scale = screen_geometry(width)
+        icons = icon_sizes(width)
+        for path in glob.glob(BACKGROUNDS_GLOB):
+            wanted.setdefault(path.replace(os.sep, "/"), set()).add((w, h))
+        for scene_id in scenes.ids():
+            for asset in scene_assets(scenes.get_scene(scene_id, "fresh"), scale, icons):
+                if asset.kind == "texture" and asset.size and min(asset.size) > 0:
+                    wanted.setdefault(asset.path, set()).add(asset.size)
+    return wanted
+
+
+def build(widths: List[int], directory: str = CACHE_DIR, force: bool = False) -> Dict[str, int]:
+    """Build missing or stale variants and prune files no longer in the manifest."""
+    os.makedirs(directory, exist_ok=True)
+    cache = AssetCache(directory)
+    old_sources = {} if force else cache._manifest_sources()
+    sources: Dict[str, Dict[str, object]] = {}
+    stats = {"built": 0, "reused": 0, "missing": 0, "removed": 0}
+
+    for path, sizes in sorted(wanted_variants(widths).items()):
+        if not os.path.exists(path):
+            print("missing source:", path)
+            stats["missing"] += 1
+            continue
+        st = os.stat(path)
+        sha = file_sha256(path)
+        old = old_sources.get(path)
+        variants = dict(old["variants"]) if old and old["sha256"] == sha else {}
+        original = None
+        for size in sorted(sizes):
+            key = size_key(size)
+            name = f"{sha[:16]}_{key}.raw"
+            if variants.get(key) == name and os.path.exists(os.path.join(directory, name)):
+                stats["reused"] += 1
+                continue
+            if original is None:
+                original = pygame.image.load(path)
+            # same nearest-neighbour scaling as SpriteCache, so pixels match
+            scaled = pygame.transform.scale(original, size)
+            write_raw(os.path.join(directory, name), scaled, (st.st_mtime_ns, st.st_size, bytes.fromhex(sha)))
+            variants[key] = name
+            stats["built"] += 1
+        sources[path] = {"sha256": sha, "mtime_ns": st.st_mtime_ns, "bytes": st.st_size, "variants": variants}
+
+    referenced = {name for entry in sources.values() for name in entry["variants"].values()}
+    for name in os.listdir(directory):
+        if name.endswith((".raw", ".bmp", ".tmp")) and name not in referenced:
+            os.remove(os.path.join(directory, name))
+            stats["removed"] += 1
+
+    write_json_atomic(cache.manifest_path, {"version": MANIFEST_VERSION, "sources": sources})
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Prebuild pre-scaled texture variants.")
+    parser.add_argument("--width", type=int, action="append",
+                        help="target display width (repeatable, default 1920)")
+    parser.add_argument("--dir", default=CACHE_DIR, help="output directory")
+    parser.add_argument("--force", action="store_true", help="ignore the manifest and rebuild everything")
+    args = parser.parse_args(argv)
+
+    stats = build(args.width or [1920], args.dir, args.force)
+    print(json.dumps(stats))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
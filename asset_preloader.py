@@ -0,0 +1,181 @@
+"""Фоновая подгрузка ассетов.
+
+Пока виден стартовый экран, текстуры и звуки текущей сцены и сцен, куда из
+неё можно перейти, декодируются в пуле потоков и складываются в общие кэши.
+Ассеты сгруппированы по сценам: текущая сцена идёт в очереди первой, и игра
+при старте ждёт только её группу. Сами списки ассетов тоже строятся в пуле.
+Озвучка по ходу игры подгружается отдельным потоком и не ждёт очереди.
+"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from layers import screen_rect
+from scene import NPC, ClickableObject, Scene
+
+Size = Tuple[int, int]
+AssetList = Union[Iterable["Asset"], Callable[[], Iterable["Asset"]]]
+PLAYER_DIRECTIONS = ("up", "down", "left", "right")
+PLAYER_FRAMES = 5
+
+
+@dataclass(frozen=True)
+class Asset:
+    kind: str  # "texture" или "sound"
+    path: str
+    size: Optional[Size] = None
+
+
+def scene_assets(scene: Scene, scale: float, icon_sizes: Sequence[Size] = ()) -> List[Asset]:
+    """Текстуры (в экранном размере) и звуки, которые понадобятся сцене.
+
+    ``icon_sizes`` — размеры, в которых рисуются картинки слов
+    (под словами в диалоге и в словаре).
+    """
+    assets: List[Asset] = []
+    player_size = screen_rect(scene._player_rect(), scale).size
+    for direction in PLAYER_DIRECTIONS:
+        for i in range(PLAYER_FRAMES):
+            assets.append(Asset("texture", f"{scene.texture_path_to_player}/{direction}{i}.png", player_size))
+
+    for obj in list(scene.objects) + list(scene.clickable_objects or []):
+        if obj.texture_path:
+            assets.append(Asset("texture", obj.texture_path, screen_rect(obj.rect, scale).size))
+        if isinstance(obj, ClickableObject):
+            if obj.inventory_texture_path:
+                assets.extend(Asset("texture", obj.inventory_texture_path, s) for s in icon_sizes)
+            if obj.voice_path:
+                assets.append(Asset("sound", obj.voice_path))
+        if isinstance(obj, NPC):
+            for line in obj.dialog_lines:
+                if isinstance(line, dict) and line.get("voice"):
+                    assets.append(Asset("sound", line["voice"]))
+            rewards = obj.reward if isinstance(obj.reward, list) else [obj.reward] if obj.reward else []
+            for _, path in rewards:
+                assets.extend(Asset("texture", path, s) for s in icon_sizes)
+    return assets
+
+
+class AssetPreloader:
+    def __init__(self, load_texture: Callable[[str, Optional[Size]], object],
+                 load_sound: Callable[[str], object], workers: int = 4):
+        self._loaders = {"texture": load_texture, "sound": load_sound}
+        self._workers = workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        # свой поток для prefetch: не стоит в очереди за предзагрузкой
+        self._prefetch_pool: Optional[ThreadPoolExecutor] = None
+        self._futures: Dict[Asset, Future] = {}
+        self._groups: Dict[str, List[Future]] = {}
+        self._prefetching: Dict[Asset, Future] = {}
+        self._lock = threading.Lock()
+        self._done = 0
+        self.errors: List[Tuple[Asset, Exception]] = []
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self._workers, thread_name_prefix="preload")
+        return self._pool
+
+    def start(self, groups: Iterable[Tuple[str, AssetList]]) -> None:
+        """Поставить группы в очередь в заданном порядке. Повторы не грузятся дважды.
+
+        Вместо списка ассетов можно передать функцию, которая его строит:
+        она выполнится в пуле. Уже начатые группы пропускаются.
+        """
+        pool = self._executor()
+        for name, assets in groups:
+            with self._lock:
+                if name in self._groups:
+                    continue
+                futures = self._groups[name] = []
+            if callable(assets):
+                futures.append(pool.submit(self._expand, futures, assets))
+            else:
+                self._submit(futures, assets)
+
+    def _expand(self, futures: List[Future], build: Callable[[], Iterable[Asset]]) -> None:
+        # загрузки добавляются в группу до того, как этот future завершится
+        try:
+            self._submit(futures, build())
+        except Exception as e:
+            print("preload error:", e)
+
+    def _submit(self, futures: List[Future], assets: Iterable[Asset]) -> None:
+        for asset in assets:
+            with self._lock:
+                if self._pool is None:  # после shutdown
+                    return
+                future = self._futures.get(asset)
+                if future is None:
+                    future = self._pool.submit(self._load, asset)
+                    self._futures[asset] = future
+                futures.append(future)
+
+    def prefetch(self, asset: Asset) -> Future:
+        """Загрузить один ассет в фоне по ходу игры (например, озвучку следующей реплики).
+
+        Пока предыдущая загрузка того же ассета не закончилась, новая не ставится.
+        Вне прогресса групп.
+        """
+        with self._lock:
+            future = self._prefetching.get(asset)
+            if future is None or future.done():
+                if self._prefetch_pool is None:
+                    self._prefetch_pool = ThreadPoolExecutor(1, thread_name_prefix="prefetch")
+                future = self._prefetch_pool.submit(self._loaders[asset.kind], *self._args(asset))
+                self._prefetching[asset] = future
+            return future
+
+    @staticmethod
+    def _args(asset: Asset) -> Tuple:
+        return (asset.path, asset.size) if asset.kind == "texture" else (asset.path,)
+
+    def _load(self, asset: Asset) -> None:
+        try:
+            self._loaders[asset.kind](*self._args(asset))
+        except Exception as e:
+            print("preload error:", asset.path, e)
+            self.errors.append((asset, e))
+        finally:
+            with self._lock:
+                self._done += 1
+
+    def progress(self) -> Tuple[int, int]:
+        """(загружено, всего)."""
+        with self._lock:
+            return self._done, len(self._futures)
+
+    def _group_futures(self, group: Optional[str]) -> List[Future]:
+        with self._lock:
+            if group is None:
+                return list(self._futures.values()) + [f for fs in self._groups.values() for f in fs]
+            return list(self._groups.get(group, []))
+
+    def is_done(self, group: Optional[str] = None) -> bool:
+        return all(f.done() for f in self._group_futures(group))
+
+    def wait(self, group: Optional[str] = None, timeout: Optional[float] = None) -> bool:
+        """Дождаться группы (или всего). False — если не успели за ``timeout``.
+
+        Пока строится список ассетов группы, в нём появляются новые загрузки,
+        поэтому ждём, пока список не перестанет расти.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            futures = self._group_futures(group)
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            _, not_done = wait(futures, remaining)
+            if not_done:
+                return False
+            if len(self._group_futures(group)) == len(futures):
+                return True
+
+    def shutdown(self) -> None:
+        """Отменить то, что ещё не начато, не дожидаясь текущих загрузок."""
+        with self._lock:
+            pools, self._pool, self._prefetch_pool = (self._pool, self._prefetch_pool), None, None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
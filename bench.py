@@ -0,0 +1,367 @@
+"""Benchmarks for scene logic, the render path and saves.
+
+Each benchmark times one operation in isolation on the real scenes from
+``scenes.py``; per-iteration setup is excluded from the timings. Results
+are printed as JSON with percentiles (microseconds).
+
+Usage::
+
+    python bench.py                            # run everything
+    python bench.py --only get_draw_data,move  # run a subset
+    python bench.py --output baseline.json     # store results
+    python bench.py --compare baseline.json    # exit 1 on regressions
+
+Rendering benchmarks use the SDL dummy video/audio drivers and are skipped
+when pygame is not installed.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+Setup = Optional[Callable[[], None]]
+Case = Tuple[Callable[[], object], Setup]
+
+BENCHMARKS: Dict[str, Callable[[], Case]] = {}
+# these run at a tenth of the iterations: each call draws a frame or touches the disk
+SLOW_BENCHMARKS = {"render_frame_full", "render_frame_walk", "load_game", "save_game"}
+_TMP_DIRS: List[str] = []
+
+
+def benchmark(name: str):
+    """Register a benchmark factory returning (fn, setup)."""
+    def decorator(factory: Callable[[], Case]) -> Callable[[], Case]:
+        BENCHMARKS[name] = factory
+        return factory
+    return decorator
+
+
+def percentile(sorted_samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(0, min(len(sorted_samples) - 1, math.ceil(q / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[rank]
+
+
+def measure(fn: Callable[[], object], setup: Setup, iterations: int, warmup: int) -> Dict[str, float]:
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+    samples = []
+    clock = time.perf_counter_ns
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = clock()
+        fn()
+        samples.append((clock() - start) / 1000.0)
+    samples.sort()
+    return {
+        "n": len(samples),
+        "mean_us": sum(samples) / len(samples),
+        "min_us": samples[0],
+        "p50_us": percentile(samples, 50),
+        "p90_us": percentile(samples, 90),
+        "p99_us": percentile(samples, 99),
+        "max_us": samples[-1],
+    }
+
+
+# ---------- scene logic ----------
+
+def _fresh(scene_id: str):
+    from scenes import scenes
+    return scenes.get_scene(scene_id, "fresh")
+
+
+@benchmark("get_draw_data")
+def _bench_get_draw_data() -> Case:
+    scene = _fresh("scene1")
+    return scene.get_draw_data, None
+
+
+@benchmark("render_state")
+def _bench_render_state() -> Case:
+    """Per-frame render state with one object moved since the last frame."""
+    scene = _fresh("scene1")
+    scene.render_state()
+    obj = scene.objects[0]
+
+    def setup() -> None:
+        obj.rect.move_ip(0.0, 0.0)
+        scene.object_changed(obj)
+
+    def frame() -> None:
+        scene.render_state().take_dirty()
+
+    return frame, setup
+
+
+@benchmark("move")
+def _bench_move() -> Case:
+    """_move with collisions: blocked by a house wall, free walk, next to an NPC."""
+    scene = _fresh("scene1")
+    starts = [(50.0, 140.0), (230.0, 220.0), (322.0, 176.0)]
+    state = {"i": 0}
+
+    def setup() -> None:
+        scene.player_pos = starts[state["i"] % len(starts)]
+        state["i"] += 1
+
+    return lambda: scene._move(4.0, 4.0), setup
+
+
+@benchmark("nearest_interactable")
+def _bench_nearest_interactable() -> Case:
+    scene = _fresh("scene1")
+    scene.player_pos = (322.0, 176.0)
+    return scene._nearest_interactable, None
+
+
+@benchmark("big_scene_queries")
+def _bench_big_scene_queries() -> Case:
+    """Collision, nearest interactable and click test on a synthetic 5000-prop scene.
+
+    Uses the NumPy object store when numpy is installed, the grid otherwise.
+    """
+    import random
+    from scene import ClickableObject, Rect, Scene, StaticObject
+    rnd = random.Random(1)
+    objects, clickables = [], []
+    for i in range(5000):
+        x, y = rnd.uniform(0, 4000), rnd.uniform(0, 4000)
+        rect = Rect(x, y, x + rnd.choice((4, 8, 16, 30)), y + rnd.choice((4, 8, 16, 30)))
+        objects.append(StaticObject(id=f"prop{i}", rect=rect, solid=rnd.random() < 0.5,
+                                    interactable=rnd.random() < 0.3))
+        clickables.append(ClickableObject(id=f"click{i}", rect=rect, translation=f"w{i}"))
+    scene = Scene(id="big", objects=objects, player_pos=(0.0, 0.0), clickable_objects=clickables)
+    points = [(rnd.uniform(0, 4000), rnd.uniform(0, 4000)) for _ in range(64)]
+    state = {"i": 0}
+
+    def setup() -> None:
+        scene.player_pos = points[state["i"] % len(points)]
+        state["i"] += 1
+
+    def queries() -> None:
+        box = scene._player_rect()
+        scene._collides_with_solid(box, 1.0, 1.0)
+        scene._nearest_interactable()
+        scene._clickable_at(box.x1, box.y1)
+
+    return queries, setup
+
+
+@benchmark("process_click")
+def _bench_process_click() -> Case:
+    scene = _fresh("scene1")
+    clickables = list(scene.clickable_objects or [])
+
+    def setup() -> None:
+        scene.clickable_objects = list(clickables)
+
+    return lambda: scene.process_click(385, 178), setup
+
+
+@benchmark("add_element")
+def _bench_add_element() -> Case:
+    import data_helper
+    scene = _fresh("scene1")
+    base = [{"word": f"сүз{i}", "texture_path": "sprites/objects/dog.png"} for i in range(200)]
+
+    def setup() -> None:
+        data_helper.use_memory_only(base)
+
+    return lambda: scene.add_element([("яңа", "sprites/objects/cat.png"), ("сүз7", "x.png")]), setup
+
+
+# ---------- render path ----------
+
+def _render_module():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    import render
+    return render
+
+
+@benchmark("render_frame_full")
+def _bench_render_frame_full() -> Case:
+    render = _render_module()
+    scene = _fresh("scene1")
+    return lambda: render.draw_frame(scene, full=True), None
+
+
+@benchmark("render_frame_walk")
+def _bench_render_frame_walk() -> Case:
+    """Partial redraw while the player walks back and forth."""
+    render = _render_module()
+    scene = _fresh("scene1")
+    state = {"i": 0}
+
+    def setup() -> None:
+        if state["i"] % 20 < 10:
+            scene.move_right()
+        else:
+            scene.move_left()
+        state["i"] += 1
+
+    return lambda: render.draw_frame(scene), setup
+
+
+# ---------- saves ----------
+
+def _save_dir() -> str:
+    """Temporary working dir with a data.json of 100 words."""
+    path = tempfile.mkdtemp(prefix="tatar_bench_")
+    _TMP_DIRS.append(path)
+    items = [{"word": f"сүз{i}", "texture_path": "sprites/objects/dog.png"} for i in range(100)]
+    with open(os.path.join(path, "data.json"), "w", encoding="utf-8") as f:
+        json.dump({"scene": "scene1", "inventory": items}, f, indent=4)
+    return path
+
+
+@benchmark("load_game")
+def _bench_load_game() -> Case:
+    import data_helper
+    path = _save_dir()
+    return lambda: _in_dir(path, data_helper.load_game), None
+
+
+@benchmark("save_game")
+def _bench_save_game() -> Case:
+    """save_game plus waiting for the background writer, i.e. the full disk write."""
+    import data_helper
+    path = _save_dir()
+    _in_dir(path, data_helper.reload_game)
+
+    def save() -> None:
+        data_helper.save_game("scene1")
+        data_helper.flush_saves()
+
+    return lambda: _in_dir(path, save), None
+
+
+@benchmark("snapshot_save")
+def _bench_snapshot_save() -> Case:
+    """Capture and encode a scene snapshot, i.e. the autosave work on the main thread."""
+    import scene_snapshot
+    scene = _fresh("scene1")
+    return lambda: scene_snapshot.encode(scene_snapshot.capture(scene)), None
+
+
+@benchmark("snapshot_restore")
+def _bench_snapshot_restore() -> Case:
+    """Decode a snapshot and restore it onto a copy of the cached template scene."""
+    import scene_snapshot
+    from scenes import scenes
+    data = scene_snapshot.encode(scene_snapshot.capture(_fresh("scene1")))
+    scenes.get_scene("scene1", "reset")
+    return lambda: scene_snapshot.restore(scene_snapshot.decode(data), scenes.get_scene("scene1", "reset")), None
+
+
+def _in_dir(path: str, fn: Callable[[], object]) -> object:
+    cwd = os.getcwd()
+    os.chdir(path)
+    try:
+        return fn()
+    finally:
+        os.chdir(cwd)
+
+
+# ---------- runner ----------
+
+def run(names: List[str], iterations: int, warmup: int) -> Dict[str, object]:
+    import data_helper
+    os.chdir(ROOT)
+    results: Dict[str, object] = {}
+    skipped: Dict[str, str] = {}
+    for name in names:
+        # scene logic must not touch the real data.json
+        data_helper.use_memory_only()
+        try:
+            fn, setup = BENCHMARKS[name]()
+        except ImportError as e:
+            skipped[name] = str(e)
+            continue
+        n = iterations
+        if name in SLOW_BENCHMARKS:
+            n = max(1, iterations // 10)
+        results[name] = measure(fn, setup, n, warmup)
+    while _TMP_DIRS:
+        shutil.rmtree(_TMP_DIRS.pop(), ignore_errors=True)
+    meta = {"python": platform.python_version(), "platform": platform.platform()}
+    if "pygame" in sys.modules:
+        import pygame
+        meta["pygame"] = pygame.version.ver
+    return {"meta": meta, "results": results, "skipped": skipped}
+
+
+def compare(current: Dict[str, object], baseline: Dict[str, object],
+            metric: str, threshold: float) -> Dict[str, Dict[str, object]]:
+    """Compare ``metric`` per benchmark; ratio above 1 + threshold is a regression."""
+    report = {}
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or metric not in base:
+            continue
+        ratio = result[metric] / base[metric] if base[metric] else float("inf")
+        report[name] = {
+            "baseline": base[metric],
+            "current": result[metric],
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold,
+        }
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark scene logic, rendering and saves.")
+    parser.add_argument("--only", help="comma-separated benchmark names (substring match)")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--output", help="write results JSON to this file")
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    parser.add_argument("--metric", default="p50_us", help="metric used by --compare")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before flagging a regression (0.25 = +25%%)")
+    parser.add_argument("--list", action="store_true", help="list benchmark names and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+
+    names = list(BENCHMARKS)
+    if args.only:
+        wanted = [w.strip() for w in args.only.split(",") if w.strip()]
+        names = [n for n in names if any(w in n for w in wanted)]
+
+    report = run(names, args.iterations, args.warmup)
+    exit_code = 0
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        report["comparison"] = compare(report, baseline, args.metric, args.threshold)
+        if any(c["regression"] for c in report["comparison"].values()):
+            exit_code = 1
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
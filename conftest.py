@@ -0,0 +1,17 @@
+import os
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import data_helper  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def memory_only_saves():
+    """Tests never read or write the real data.json."""
+    data_helper.use_memory_only()
+    yield
+    data_helper.use_memory_only()
@@ -1,6 +1,19 @@
 import json
+import time
 from typing import List, Dict, Optional
 
+from inventory_store import InventoryStore
+from save_writer import SAVE_WRITER, SNAPSHOT_WRITER
+
+# Last known save contents and the in-memory inventory. Both are loaded from
+# ``data.json`` once; afterwards the file is only written, never re-read.
+_data: Optional[Dict[str, object]] = None
+_inventory: Optional[InventoryStore] = None
+# False for headless runs and benchmarks: changes stay in memory only.
+_persistence_enabled = True
+# Binary scene snapshot (see scene_snapshot), next to data.json.
+SNAPSHOT_PATH = SNAPSHOT_WRITER.path
+
 
 def load_game() -> Dict[str, object]:
     """Load the persisted game data from ``data.json``.
@@ -13,29 +26,96 @@ def load_game() -> Dict[str, object]:
     return data
 
 
+def _cached_data() -> Dict[str, object]:
+    global _data
+    if _data is None:
+        _data = load_game()
+    return _data
+
+
+def get_inventory_store() -> InventoryStore:
+    """Return the process-wide inventory, loading it on first use."""
+    global _inventory
+    if _inventory is None:
+        _inventory = InventoryStore(_cached_data()["inventory"])
+    return _inventory
+
+
+def reload_game() -> Dict[str, object]:
+    """Re-read ``data.json`` into memory and resume writing saves to it."""
+    global _data, _inventory, _persistence_enabled
+    _persistence_enabled = True
+    _data = load_game()
+    _inventory = InventoryStore(_data["inventory"])
+    return _data
+
+
+def use_memory_only(inventory: Optional[List[Dict[str, str]]] = None) -> None:
+    """Detach from ``data.json``: start from ``inventory`` and never write saves."""
+    global _data, _inventory, _persistence_enabled
+    _persistence_enabled = False
+    _data = {"inventory": []}
+    _inventory = InventoryStore(inventory or [])
+
+
+def _persist() -> None:
+    """Queue a snapshot for the background writer; never blocks on disk."""
+    if not _persistence_enabled:
+        return
+    data = dict(_cached_data())
+    data["inventory"] = get_inventory_store().to_list()
+    SAVE_WRITER.submit(data)
+
+
+def flush_saves(timeout: Optional[float] = None) -> bool:
+    """Wait until all queued saves are written. Returns False on timeout.
+
+    ``timeout`` covers both writers together, not each one.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    saves_done = SAVE_WRITER.flush(timeout)
+    remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+    snapshot_done = SNAPSHOT_WRITER.flush(remaining)
+    return saves_done and snapshot_done
+
+
+def save_snapshot(data: bytes) -> None:
+    """Queue an encoded scene snapshot for the background writer."""
+    if _persistence_enabled:
+        SNAPSHOT_WRITER.submit(data)
+
+
+def load_snapshot() -> Optional[bytes]:
+    """The last written scene snapshot, or None if there is none."""
+    try:
+        with open(SNAPSHOT_PATH, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
 def save_game(scene_name: str, inventory: Optional[List[Dict[str, str]]] = None) -> None:
     """Persist the current scene and inventory back to ``data.json``.
 
-    If ``inventory`` is omitted the previously saved inventory is kept.
+    If ``inventory`` is omitted the in-memory inventory is saved.
     """
-    data = load_game()
-    data["scene"] = scene_name
     if inventory is not None:
-        data["inventory"] = inventory
-    with open("data.json", "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
+        get_inventory_store().replace(inventory)
+    _cached_data()["scene"] = scene_name
+    _persist()
+
+
+def load_scene_name() -> Optional[str]:
+    """Return the scene stored by the last ``save_game`` (from memory)."""
+    return _cached_data().get("scene")
 
 
 def load_inventory() -> List[Dict[str, str]]:
-    """Return the list of inventory items from the save file."""
-    return load_game().get("inventory", [])
+    """Return the list of inventory items (from memory, not from disk)."""
+    return get_inventory_store().items
 
 
 def add_inventory_item(word: str, texture_path: str) -> None:
     """Append a new item to the inventory and save it."""
-    data = load_game()
-    items = data.setdefault("inventory", [])
-    items.append({"word": word, "texture_path": texture_path})
-    with open("data.json", "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
-
+    get_inventory_store().add(word, texture_path)
+    _persist()
@@ -0,0 +1,116 @@
+"""Раскладка строки диалога.
+
+Всё, что не меняется, пока на экране одна и та же реплика — переносы строк,
+позиции слов, отрисованные слова, иконки из словаря под словами и геометрия
+окна — считается один раз в ``layout_dialog``. Отрисовка кадра сводится
+к заливке окна и набору blit'ов.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+import pygame
+
+from sprite_cache import get_sprite
+from text_cache import render_text
+
+ICON_GAP = 5  # отступ иконки от слова
+PUNCTUATION = ".,!?;:\"'"
+
+
+@dataclass
+class DialogLayout:
+    box: pygame.Rect
+    # (поверхность, левый верхний угол)
+    words: List[Tuple[pygame.Surface, Tuple[int, int]]] = field(default_factory=list)
+    icons: List[Tuple[pygame.Surface, pygame.Rect]] = field(default_factory=list)
+    # окно вместе с иконками — область для частичной перерисовки
+    bounds: pygame.Rect = None
+
+
+def _wrap(widths: Sequence[int], space_w: int, max_width: int) -> List[List[int]]:
+    """Жадный перенос: индексы слов по строкам. Слишком длинное слово — отдельной строкой."""
+    lines: List[List[int]] = []
+    current: List[int] = []
+    current_w = 0
+    for i, w in enumerate(widths):
+        if current and current_w + space_w + w > max_width:
+            lines.append(current)
+            current, current_w = [], 0
+        current_w += w if not current else space_w + w
+        current.append(i)
+    if current:
+        lines.append(current)
+    return lines
+
+
+def layout_dialog(text: str, items: Sequence[Dict[str, str]], screen_size: Tuple[int, int],
+                  font: pygame.font.Font, color: Tuple[int, int, int],
+                  box_height: int, max_line_width: int) -> DialogLayout:
+    """Разложить реплику ``text`` по строкам в окне у нижнего края экрана.
+
+    Под словами, которые есть в словаре ``items``, рисуется их картинка.
+    Если строк больше одной, окно растёт вверх.
+    """
+    width, height = screen_size
+    words = text.split()
+    surfaces = [render_text(font, w, color) for w in words]
+    space_w = font.size(" ")[0]
+    font_h = font.get_height()
+    icon_size = font_h
+    row_h = font_h + ICON_GAP + icon_size + ICON_GAP
+
+    lines = _wrap([s.get_width() for s in surfaces], space_w, max_line_width) or [[]]
+    box_h = max(box_height, len(lines) * row_h + font_h)
+    box = pygame.Rect(0, height - box_h, width, box_h)
+    y = box.y + (box_h - font_h) // 2 - (len(lines) - 1) * row_h // 2
+
+    inventory_map = {item["word"].lower(): item["texture_path"] for item in items}
+    layout = DialogLayout(box=box)
+    bounds = box.copy()
+    for line in lines:
+        line_w = sum(surfaces[i].get_width() for i in line) + space_w * max(0, len(line) - 1)
+        x = (width - line_w) // 2
+        for i in line:
+            surf = surfaces[i]
+            layout.words.append((surf, (x, y)))
+            clean = words[i].strip(PUNCTUATION).lower()
+            if clean in inventory_map:
+                img = get_sprite(inventory_map[clean], (icon_size, icon_size))
+                img_rect = img.get_rect(center=(x + surf.get_width() // 2,
+                                                y + surf.get_height() + icon_size // 2 + ICON_GAP))
+                layout.icons.append((img, img_rect))
+                bounds.union_ip(img_rect)
+            x += surf.get_width() + space_w
+        y += row_h
+    layout.bounds = bounds.clip(pygame.Rect(0, 0, width, height))
+    return layout
+
+
+class DialogLayoutCache:
+    """Раскладки по ключу (текст, версия словаря, размер экрана, стиль).
+
+    Стиль — шрифт, цвет и размеры окна — входит в ключ, иначе два окна
+    с одной репликой получили бы одну раскладку. При переполнении
+    выбрасывается самая давно использованная раскладка.
+    """
+
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max_entries
+        self._layouts: "OrderedDict[Hashable, DialogLayout]" = OrderedDict()
+
+    def get(self, text: str, items: Sequence[Dict[str, str]], inventory_version: int,
+            screen_size: Tuple[int, int], *, font: pygame.font.Font, color: Tuple[int, int, int],
+            box_height: int, max_line_width: int) -> DialogLayout:
+        key = (text, inventory_version, screen_size, font, font.get_height(), tuple(color),
+               box_height, max_line_width)
+        layout = self._layouts.get(key)
+        if layout is not None:
+            self._layouts.move_to_end(key)
+            return layout
+        layout = layout_dialog(text, items, screen_size, font=font, color=color,
+                               box_height=box_height, max_line_width=max_line_width)
+        self._layouts[key] = layout
+        while len(self._layouts) > self.max_entries:
+            self._layouts.popitem(last=False)
+        return layout
@@ -0,0 +1,111 @@
+"""Замер времени по фазам кадра.
+
+Кадр размечается вызовами ``mark(phase)``: время с предыдущей отметки
+приписывается фазе. Готовые кадры складываются в кольцевой буфер
+фиксированного размера. Когда замер выключен, ``begin_frame``/``mark``/
+``end_frame`` сразу возвращаются.
+"""
+import csv
+import math
+import time
+from typing import Dict, List, Optional, Sequence
+
+PHASES = (
+    "events", "movement", "autosave", "render_state", "layers", "sort", "blits",
+    "dialog_inventory", "notifications", "hud", "flip", "voice",
+)
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    i = min(len(sorted_values) - 1, max(0, math.ceil(len(sorted_values) * q / 100.0) - 1))
+    return sorted_values[i]
+
+
+class FrameTimer:
+    def __init__(self, phases: Sequence[str] = PHASES, capacity: int = 600):
+        self.enabled = False
+        self.phases = tuple(phases)
+        self.capacity = capacity
+        self._index = {p: i for i, p in enumerate(self.phases)}
+        # строка буфера: длительности фаз, затем период кадра (всё в мс)
+        self._rows: List[List[float]] = [[0.0] * (len(self.phases) + 1) for _ in range(capacity)]
+        self._count = 0
+        self._pos = 0
+        self._row: Optional[List[float]] = None
+        self._t = 0.0
+        self._frame_start: Optional[float] = None
+
+    def begin_frame(self) -> None:
+        if not self.enabled:
+            self._frame_start = None
+            return
+        now = time.perf_counter()
+        row = self._rows[self._pos]
+        for i in range(len(row)):
+            row[i] = 0.0
+        if self._frame_start is not None and self._row is not None:
+            # период прошлого кадра, включая ожидание clock.tick()
+            self._row[-1] = (now - self._frame_start) * 1000.0
+        self._row = row
+        self._frame_start = now
+        self._t = now
+
+    def mark(self, phase: str) -> None:
+        if not self.enabled or self._row is None:
+            return
+        now = time.perf_counter()
+        self._row[self._index[phase]] += (now - self._t) * 1000.0
+        self._t = now
+
+    def end_frame(self) -> None:
+        if not self.enabled or self._row is None:
+            return
+        self._pos = (self._pos + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def clear(self) -> None:
+        self._count = 0
+        self._pos = 0
+        self._row = None
+        self._frame_start = None
+
+    def frames(self) -> List[List[float]]:
+        """Кадры из буфера, от старых к новым."""
+        start = (self._pos - self._count) % self.capacity
+        return [self._rows[(start + i) % self.capacity] for i in range(self._count)]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Среднее, p95 и p99 по каждой фазе и по всему кадру, плюс достигнутый FPS."""
+        frames = self.frames()
+        result: Dict[str, Dict[str, float]] = {}
+        if not frames:
+            return result
+        columns = list(self.phases) + ["frame"]
+        for i, name in enumerate(columns):
+            values = sorted(f[i] for f in frames if name != "frame" or f[i] > 0)
+            if not values:
+                continue
+            result[name] = {
+                "avg": sum(values) / len(values),
+                "p95": _percentile(values, 95),
+                "p99": _percentile(values, 99),
+            }
+        frame = result.get("frame")
+        if frame and frame["avg"] > 0:
+            result["fps"] = {"avg": 1000.0 / frame["avg"]}
+        return result
+
+    def dump_csv(self, path: str) -> int:
+        """Записать буфер в CSV. Возвращает число кадров."""
+        frames = self.frames()
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame"] + list(self.phases) + ["frame_ms"])
+            for n, row in enumerate(frames):
+                writer.writerow([n] + [f"{v:.4f}" for v in row])
+        return len(frames)
+
+
+FRAME_TIMER = FrameTimer()
@@ -0,0 +1,141 @@
+"""Run scene logic without a window, sound or pygame.
+
+A script is a whitespace-separated list of steps, one tick each::
+
+    move_right*23 move_forward*11 interact wait*10 process_click(385,178)
+
+- ``action*N`` repeats a step for N ticks;
+- ``move_forward+move_right`` holds several movement keys in one tick;
+- ``process_click(x,y)`` clicks at game coordinates (496x279 space);
+- ``#`` starts a comment that runs to the end of the line.
+
+Actions: move_forward, move_back, move_left, move_right, interact,
+toggle_inventory, process_click, wait.
+
+Usage::
+
+    python headless.py scene1 "move_right*23 move_forward*11 interact"
+    python headless.py scene1 @route.txt --draw-data
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import data_helper
+from scene import Scene
+from scenes import scenes
+
+MOVE_ACTIONS = ("move_forward", "move_back", "move_left", "move_right")
+ACTIONS = MOVE_ACTIONS + ("interact", "toggle_inventory", "process_click", "wait")
+
+_STEP_RE = re.compile(r"^(?P<actions>[a-z_+]+)(?:\((?P<args>[^)]*)\))?(?:\*(?P<count>\d+))?$")
+
+
+@dataclass
+class Step:
+    actions: Tuple[str, ...]
+    args: Tuple[int, ...] = ()
+    count: int = 1
+
+
+def parse_script(text: str) -> List[Step]:
+    """Parse a script into steps. Raises ``ValueError`` on unknown actions."""
+    steps = []
+    for line in text.splitlines():
+        line = line.split("#", 1)[0]
+        for token in line.split():
+            m = _STEP_RE.match(token)
+            if m is None:
+                raise ValueError(f"bad step: {token!r}")
+            actions = tuple(m.group("actions").split("+"))
+            for action in actions:
+                if action not in ACTIONS:
+                    raise ValueError(f"unknown action {action!r} in {token!r}")
+            if len(actions) > 1 and any(a not in MOVE_ACTIONS for a in actions):
+                raise ValueError(f"only movement can be combined: {token!r}")
+            args = tuple(int(a) for a in m.group("args").split(",")) if m.group("args") else ()
+            if ("process_click" in actions) != (len(args) == 2):
+                raise ValueError(f"process_click needs exactly (x,y): {token!r}")
+            steps.append(Step(actions, args, int(m.group("count") or 1)))
+    return steps
+
+
+def apply_step(scene: Scene, step: Step) -> Optional[Scene]:
+    """Apply one tick of ``step``. Returns the next scene on a transition."""
+    for action in step.actions:
+        if action in MOVE_ACTIONS:
+            getattr(scene, action)()
+        elif action == "interact":
+            return scene.interact()
+        elif action == "toggle_inventory":
+            scene.toggle_inventory()
+        elif action == "process_click":
+            scene.process_click(*step.args)
+    return None
+
+
+def run(scene_id: str, steps: List[Step], draw_data: bool = False,
+        inventory: Optional[List[Dict[str, str]]] = None) -> Dict[str, object]:
+    """Play ``steps`` from a fresh ``scene_id`` as fast as possible.
+
+    Saves are kept in memory. With ``draw_data`` every tick also calls
+    ``render_state`` like the render loop does.
+    """
+    data_helper.use_memory_only(inventory)
+    scene = scenes.get_scene(scene_id, "fresh")
+    transitions = []
+    ticks = 0
+
+    start = time.perf_counter()
+    for step in steps:
+        for _ in range(step.count):
+            next_scene = apply_step(scene, step)
+            if next_scene is not None:
+                transitions.append({"tick": ticks, "from": scene.id, "to": next_scene.id})
+                scene = next_scene
+            if draw_data:
+                scene.render_state()
+            ticks += 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        "scene": scene.id,
+        "player_pos": list(scene.player_pos),
+        "ui_mode": scene.text_window.mode,
+        "ui_text": scene.text_window.text,
+        "inventory_open": scene.inventory_open,
+        "inventory": [item["word"] for item in data_helper.load_inventory()],
+        "transitions": transitions,
+        "ticks": ticks,
+        "elapsed_s": elapsed,
+        "ticks_per_s": ticks / elapsed if elapsed > 0 else float("inf"),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run a scene headlessly with scripted input.")
+    parser.add_argument("scene", choices=scenes.ids())
+    parser.add_argument("script", help="steps, or @file to read them from a file")
+    parser.add_argument("--draw-data", action="store_true", help="call render_state every tick")
+    parser.add_argument("--repeat", type=int, default=1, help="repeat the whole script N times")
+    args = parser.parse_args(argv)
+
+    text = args.script
+    if text.startswith("@"):
+        with open(text[1:], "r", encoding="utf-8") as f:
+            text = f.read()
+    try:
+        steps = parse_script(text) * args.repeat
+    except ValueError as e:
+        parser.error(str(e))
+    result = run(args.scene, steps, draw_data=args.draw_data)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+from typing import Dict, Iterable, List, Optional
+
+InventoryItem = Dict[str, str]
+
+
+class InventoryStore:
+    """In-memory inventory: ordered item list plus a word index.
+
+    ``version`` grows on every change so renderers can cheaply tell whether
+    anything derived from the inventory has to be rebuilt.
+    """
+
+    def __init__(self, items: Optional[Iterable[InventoryItem]] = None):
+        self.version = 0
+        self._items: List[InventoryItem] = []
+        self._by_word: Dict[str, InventoryItem] = {}
+        for item in items or ():
+            self._append(item)
+
+    def _append(self, item: InventoryItem) -> None:
+        self._items.append(item)
+        self._by_word.setdefault(item["word"], item)
+
+    @property
+    def items(self) -> List[InventoryItem]:
+        """Items in the order they were collected. Do not modify in place."""
+        return self._items
+
+    def has(self, word: str) -> bool:
+        return word in self._by_word
+
+    def get(self, word: str) -> Optional[InventoryItem]:
+        return self._by_word.get(word)
+
+    def add(self, word: str, texture_path: str) -> InventoryItem:
+        item = {"word": word, "texture_path": texture_path}
+        self._append(item)
+        self.version += 1
+        return item
+
+    def replace(self, items: Iterable[InventoryItem]) -> None:
+        """Replace the whole inventory (e.g. when a save is loaded)."""
+        self._items = []
+        self._by_word = {}
+        for item in items:
+            self._append(item)
+        self.version += 1
+
+    def to_list(self) -> List[InventoryItem]:
+        """A copy suitable for serialization."""
+        return [dict(item) for item in self._items]
+
+    def __len__(self) -> int:
+        return len(self._items)
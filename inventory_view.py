@@ -0,0 +1,85 @@
+"""Экран словаря (инвентаря).
+
+Страница словаря рисуется один раз во внеэкранную поверхность размером
+с экран и дальше только копируется на экран. Перерисовывается, когда меняется
+версия инвентаря, размер экрана или номер страницы. Слова, которые не
+помещаются на экран, разбиты на страницы — рисуется только видимая.
+"""
+from typing import Dict, Optional, Sequence, Tuple
+
+import pygame
+
+from sprite_cache import get_sprite
+from text_cache import render_text
+
+
+class InventoryView:
+    def __init__(self, font: pygame.font.Font, color: Tuple[int, int, int],
+                 background: Tuple[int, int, int], border_color: Tuple[int, int, int],
+                 border_width: int):
+        self.font = font
+        self.color = color
+        self.background = background
+        self.border_color = border_color
+        self.border_width = border_width
+        self.page = 0
+        self.renders = 0
+        self._surface: Optional[pygame.Surface] = None
+        self._key = None
+        self._page_count = 1
+
+    @staticmethod
+    def grid(screen_size: Tuple[int, int], font_h: int) -> Tuple[int, int, int, int]:
+        """(размер иконки, отступ, колонок, строк на странице)."""
+        width, height = screen_size
+        item_size = int(height / 6)
+        padding = int(item_size * 0.5)
+        cols = max(1, (width - padding) // (item_size + padding))
+        # снизу оставляем строку под номер страницы
+        rows = max(1, (height - padding - font_h) // (item_size + font_h + padding))
+        return item_size, padding, cols, rows
+
+    def page_count(self, count: int, screen_size: Tuple[int, int]) -> int:
+        _, _, cols, rows = self.grid(screen_size, self.font.get_height())
+        return max(1, -(-count // (cols * rows)))
+
+    def scroll(self, delta: int) -> None:
+        """Перелистнуть на ``delta`` страниц (с ограничением по краям при отрисовке)."""
+        self.page = max(0, min(self._page_count - 1, self.page + delta))
+
+    def surface(self, items: Sequence[Dict[str, str]], version: int,
+                screen_size: Tuple[int, int]) -> pygame.Surface:
+        """Готовая поверхность текущей страницы словаря."""
+        self._page_count = self.page_count(len(items), screen_size)
+        self.page = min(self.page, self._page_count - 1)
+        key = (version, screen_size, self.page)
+        if self._surface is None or key != self._key:
+            self._surface = self._render(items, screen_size)
+            self._key = key
+            self.renders += 1
+        return self._surface
+
+    def _render(self, items: Sequence[Dict[str, str]], screen_size: Tuple[int, int]) -> pygame.Surface:
+        surface = pygame.Surface(screen_size)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        rect = surface.get_rect()
+        pygame.draw.rect(surface, self.background, rect)
+        pygame.draw.rect(surface, self.border_color, rect, width=self.border_width)
+
+        font_h = self.font.get_height()
+        item_size, padding, cols, rows = self.grid(screen_size, font_h)
+        per_page = cols * rows
+        first = self.page * per_page
+        for i, item in enumerate(items[first:first + per_page]):
+            sprite = get_sprite(item["texture_path"], (item_size, item_size))
+            x = padding + (i % cols) * (item_size + padding)
+            y = padding + (i // cols) * (item_size + font_h + padding)
+            surface.blit(sprite, (x, y))
+            text_surface = render_text(self.font, item["word"], self.color)
+            surface.blit(text_surface, text_surface.get_rect(center=(x + item_size // 2, y + item_size + font_h // 2)))
+
+        if self._page_count > 1:
+            label = render_text(self.font, f"< {self.page + 1}/{self._page_count} >", self.color)
+            surface.blit(label, label.get_rect(midbottom=(rect.centerx, rect.bottom - padding // 4)))
+        return surface
@@ -0,0 +1,169 @@
+"""Слои отрисовки сцены.
+
+Неподвижные неинтерактивные объекты (StaticObject), которые при текущем
+положении игрока гарантированно рисуются под ним, запекаются в одну
+поверхность размером с экран. Всё остальное — объекты, которые могут
+оказаться поверх игрока по (z, y2), NPC и интерактивные объекты — попадает
+в небольшой передний слой и рисуется поштучно.
+
+Слои работают с записями ``RenderState`` и пересобираются только при смене
+сцены, изменении состава объектов (``RenderState.structure_version``),
+изменении запекаемого объекта или когда игрок пересекает по (z, y2) один
+из запечённых объектов. Изменения объектов переднего слоя фон не трогают.
+
+Передний слой хранится уже упорядоченным по (z, y2); при равных ключах
+объекты идут в порядке сцены, а игрок — после них. Слой сортируется только
+при перестройке; сдвинувшиеся объекты и игрок переставляются в нём
+бинарным поиском. Так же, без пересортировки, обновляется и список
+подвижных объектов, по которому считается граница фона.
+"""
+import heapq
+import math
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+from scene import Rect, RenderRecord, RenderState
+from sprite_cache import get_sprite
+
+DrawKey = Tuple[int, float]
+OrderKey = Tuple[int, float, float]  # (z, y2, номер в сцене); у игрока номер — inf
+
+
+def draw_key(z: int, rect: Rect) -> DrawKey:
+    """Ключ порядка отрисовки: сначала z, затем нижняя граница."""
+    return z, rect.y2
+
+
+def screen_rect(rect: Rect, scale: float) -> pygame.Rect:
+    """Перевод игрового прямоугольника в пиксели экрана."""
+    return pygame.Rect(
+        int(rect.x1 * scale),
+        int(rect.y1 * scale),
+        int((rect.x2 - rect.x1) * scale),
+        int((rect.y2 - rect.y1) * scale),
+    )
+
+
+def _move(records: List[RenderRecord], keys: List[OrderKey], placed: Dict[int, OrderKey],
+          record: RenderRecord, key: OrderKey) -> None:
+    """Переставить ``record`` в упорядоченном списке на место по новому ключу.
+
+    ``keys`` идут параллельно ``records``, ``placed`` — текущий ключ каждой записи.
+    Ключи уникальны (в них номер объекта в сцене), поэтому старое место
+    находится бинарным поиском.
+    """
+    old = placed.get(id(record))
+    if old == key:
+        return
+    if old is not None:
+        i = bisect_left(keys, old)
+        del keys[i]
+        del records[i]
+    i = bisect_left(keys, key)
+    keys.insert(i, key)
+    records.insert(i, record)
+    placed[id(record)] = key
+
+
+class SceneLayers:
+    def __init__(self, size: Tuple[int, int], scale: float):
+        self.size = size
+        self.scale = scale
+        self.background = self._new_surface()
+        # объекты, которые рисуются каждый кадр вместе с игроком, в порядке отрисовки
+        self.foreground: List[RenderRecord] = []
+        self.rebuilds = 0
+
+        self._state: Optional[RenderState] = None
+        self._version = -1
+        self._static: List[RenderRecord] = []  # отсортированы по order_key
+        self._static_keys: List[DrawKey] = []
+        self._dynamic: List[RenderRecord] = []  # отсортированы по order_key
+        self._dynamic_keys: List[OrderKey] = []
+        self._dynamic_placed: Dict[int, OrderKey] = {}
+        self._split = -1
+        # порядок объектов в сцене (для равных ключей) и ключи записей в foreground
+        self._seq: Dict[int, int] = {}
+        self._foreground_keys: List[OrderKey] = []
+        self._placed: Dict[int, OrderKey] = {}
+        self._player_key: Optional[OrderKey] = None
+
+    def _new_surface(self) -> pygame.Surface:
+        surface = pygame.Surface(self.size)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        return surface
+
+    def order_key(self, record: RenderRecord) -> OrderKey:
+        return record.z, record.rect.y2, self._seq[id(record)]
+
+    def update(self, state: RenderState) -> bool:
+        """Синхронизировать слои с состоянием сцены.
+
+        True — если фон был перестроен или изменились объекты переднего слоя,
+        то есть кадр нужно перерисовать целиком.
+        """
+        dirty = state.take_dirty()
+        if state is not self._state or state.structure_version != self._version or any(r.static for r in dirty):
+            self._classify(state)
+            self._split = -1
+        elif dirty:
+            # изменились только объекты переднего слоя: фон тот же, граница могла сдвинуться
+            for r in dirty:
+                if id(r) in self._dynamic_placed:
+                    key = self.order_key(r)
+                    _move(self._dynamic, self._dynamic_keys, self._dynamic_placed, r, key)
+                    if id(r) in self._placed:
+                        _move(self.foreground, self._foreground_keys, self._placed, r, key)
+
+        limit = draw_key(state.player.z, state.player.rect)
+        if self._dynamic_keys and self._dynamic_keys[0][:2] < limit:
+            # список упорядочен, поэтому первый ключ — самый нижний из подвижных
+            limit = self._dynamic_keys[0][:2]
+        split = bisect_left(self._static_keys, limit)
+        if split == self._split:
+            return bool(dirty)
+
+        self._split = split
+        self._bake()
+        return True
+
+    def draw_order(self, player: RenderRecord) -> List[RenderRecord]:
+        """Передний слой вместе с игроком в порядке отрисовки.
+
+        Игрок хранится в слое и переставляется, только когда меняется его ключ.
+        Возвращаемый список принадлежит слоям — его нельзя менять.
+        """
+        key = (player.z, player.rect.y2, math.inf)
+        if key != self._player_key:
+            _move(self.foreground, self._foreground_keys, self._placed, player, key)
+            self._player_key = key
+        return self.foreground
+
+    def _classify(self, state: RenderState) -> None:
+        self._state = state
+        self._version = state.structure_version
+        self._seq = {id(r): i for i, r in enumerate(state.objects)}
+        visible = [r for r in state.objects if r.texture_path is not None]
+        static = [r for r in visible if r.static]
+        self._dynamic = [r for r in visible if not r.static]
+        static.sort(key=self.order_key)
+        self._dynamic.sort(key=self.order_key)
+        self._static = static
+        self._static_keys = [draw_key(r.z, r.rect) for r in static]
+        self._dynamic_keys = [self.order_key(r) for r in self._dynamic]
+        self._dynamic_placed = dict(zip(map(id, self._dynamic), self._dynamic_keys))
+
+    def _bake(self) -> None:
+        self.background.fill((0, 0, 0))
+        for r in self._static[:self._split]:
+            rect = screen_rect(r.rect, self.scale)
+            self.background.blit(get_sprite(r.texture_path, rect.size), rect)
+        # обе части уже упорядочены — достаточно слить
+        self.foreground = list(heapq.merge(self._static[self._split:], self._dynamic, key=self.order_key))
+        self._foreground_keys = [self.order_key(r) for r in self.foreground]
+        self._placed = dict(zip(map(id, self.foreground), self._foreground_keys))
+        self._player_key = None
+        self.rebuilds += 1
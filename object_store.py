@@ -0,0 +1,141 @@
+"""Объекты сцены в массивах NumPy (struct-of-arrays).
+
+Прямоугольники, флаги solid/interactable, z и порядок объектов лежат
+в отдельных массивах, синхронизированных с самими объектами. Запросы
+«пересекает ли прямоугольник твёрдый объект», «ближайший интерактивный
+в радиусе» и «в какой объект попал клик» выполняются одним векторным
+вычислением по всем объектам сразу.
+
+NumPy — необязательная зависимость: без него ``HAVE_NUMPY`` ложно,
+и сцена пользуется сеткой (``spatial_grid``).
+"""
+import math
+from typing import Dict, Generic, List, Optional, Tuple, TypeVar
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - зависит от окружения
+    np = None
+
+HAVE_NUMPY = np is not None
+
+T = TypeVar("T")
+
+X1, Y1, X2, Y2 = range(4)
+
+
+class ObjectArrays(Generic[T]):
+    def __init__(self, capacity: int = 64):
+        if np is None:
+            raise ImportError("ObjectArrays requires numpy")
+        self._n = 0
+        self._objects: List[Optional[T]] = []
+        # id(obj) -> строка в массивах; сами объекты могут быть нехэшируемыми
+        self._rows: Dict[int, int] = {}
+        self._alloc(max(1, capacity))
+
+    def _alloc(self, capacity: int) -> None:
+        n = self._n
+        old = getattr(self, "rects", None)
+        # по строке на координату: столбцы x1/y1/x2/y2 лежат в памяти подряд
+        rects = np.zeros((4, capacity), dtype=np.float64)
+        solid = np.zeros(capacity, dtype=bool)
+        interactable = np.zeros(capacity, dtype=bool)
+        z = np.zeros(capacity, dtype=np.int64)
+        order = np.zeros(capacity, dtype=np.int64)
+        if old is not None:
+            rects[:, :n] = self.rects[:, :n]
+            solid[:n] = self.solid[:n]
+            interactable[:n] = self.interactable[:n]
+            z[:n] = self.z[:n]
+            order[:n] = self.order[:n]
+        self.rects, self.solid, self.interactable, self.z, self.order = rects, solid, interactable, z, order
+        self._objects.extend([None] * (capacity - len(self._objects)))
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __contains__(self, obj: T) -> bool:
+        return id(obj) in self._rows
+
+    def add(self, obj: T, order: int) -> None:
+        """Добавить объект (или обновить, если уже есть). ``order`` решает ничьи в запросах."""
+        row = self._rows.get(id(obj))
+        if row is None:
+            if self._n == self.rects.shape[1]:
+                self._alloc(2 * self.rects.shape[1])
+            row = self._n
+            self._n += 1
+            self._rows[id(obj)] = row
+            self._objects[row] = obj
+        self.order[row] = order
+        self.update(obj)
+
+    def update(self, obj: T) -> None:
+        """Переписать rect, флаги и z объекта из самого объекта."""
+        row = self._rows[id(obj)]
+        r = obj.rect
+        self.rects[:, row] = (r.x1, r.y1, r.x2, r.y2)
+        self.solid[row] = getattr(obj, "solid", False)
+        self.interactable[row] = getattr(obj, "interactable", False)
+        self.z[row] = getattr(obj, "z", 0)
+
+    def remove(self, obj: T) -> None:
+        row = self._rows.pop(id(obj), None)
+        if row is None:
+            return
+        # последняя строка переезжает на место удалённой
+        last = self._n - 1
+        if row != last:
+            moved = self._objects[last]
+            self.rects[:, row] = self.rects[:, last]
+            for arr in (self.solid, self.interactable, self.z, self.order):
+                arr[row] = arr[last]
+            self._objects[row] = moved
+            self._rows[id(moved)] = row
+        self._objects[last] = None
+        self._n = last
+
+    def _overlaps(self, x1: float, y1: float, x2: float, y2: float):
+        r = self.rects[:, :self._n]
+        return (x2 > r[X1]) & (x1 < r[X2]) & (y2 > r[Y1]) & (y1 < r[Y2])
+
+    def collides_solid(self, x1: float, y1: float, x2: float, y2: float) -> bool:
+        """Пересекает ли прямоугольник хотя бы один твёрдый объект (касание — не пересечение)."""
+        return bool(np.any(self.solid[:self._n] & self._overlaps(x1, y1, x2, y2)))
+
+    def nearest_interactable(self, px: float, py: float, max_dist: float) -> Tuple[Optional[T], float]:
+        """Ближайший интерактивный объект не дальше max_dist от точки; (None, inf), если нет.
+
+        При равных расстояниях побеждает меньший ``order``.
+        """
+        n = self._n
+        r = self.rects[:, :n]
+        # сначала дешёвый отбор по квадрату вокруг точки (границы включительно)
+        rows = np.flatnonzero(self.interactable[:n] & (r[X1] <= px + max_dist) & (r[X2] >= px - max_dist)
+                              & (r[Y1] <= py + max_dist) & (r[Y2] >= py - max_dist))
+        if len(rows) == 0:
+            return None, math.inf
+        r = r[:, rows]
+        dx = np.maximum(np.maximum(r[X1] - px, 0.0), px - r[X2])
+        dy = np.maximum(np.maximum(r[Y1] - py, 0.0), py - r[Y2])
+        d = np.hypot(dx, dy)
+        near = d <= max_dist
+        if not near.any():
+            return None, math.inf
+        d = np.where(near, d, np.inf)
+        best = rows[d == d.min()]
+        row = best[np.argmin(self.order[best])] if len(best) > 1 else best[0]
+        obj = self._objects[int(row)]
+        r = obj.rect
+        # расстояние считаем так же, как скалярный distance_point_to_rect
+        return obj, math.hypot(max(r.x1 - px, 0, px - r.x2), max(r.y1 - py, 0, py - r.y2))
+
+    def hit(self, x: float, y: float) -> Optional[T]:
+        """Объект, в который попадает точка (границы включительно); первый по ``order``."""
+        r = self.rects[:, :self._n]
+        inside = np.flatnonzero((r[X1] <= x) & (x <= r[X2]) & (r[Y1] <= y) & (y <= r[Y2]))
+        if len(inside) == 0:
+            return None
+        row = inside[np.argmin(self.order[inside])]
+        return self._objects[int(row)]
@@ -0,0 +1,218 @@
+"""Decoded pixels on disk, loaded with mmap.
+
+A ``.raw`` file is a 64-byte header followed by the pixels, 4 bytes per
+pixel with no row padding. The header stores the pixel size and byte order
+("RGBA", "BGRA" or "ARGB"). It also stores the source image's mtime, size
+and sha256, so a stale file can be detected without decoding anything.
+
+``load_raw`` maps the file copy-on-write and hands the mapping straight to
+``pygame.image.frombuffer``, so no copy is made. The OS page cache is shared
+between game processes. When the stored byte order matches the display's,
+the surface is used as is; otherwise it is converted once.
+
+``RawPixelCache`` keeps such files for decoded source PNGs: the first
+process decodes a PNG and writes its pixels, and later processes map them.
+Hashing the source and writing the file happen on a background thread, so
+a sprite miss during a frame does not wait for the disk.
+"""
+import hashlib
+import mmap
+import os
+import queue
+import struct
+import sys
+import threading
+from typing import Optional, Set, Tuple
+
+import pygame
+
+MAGIC = b"PXRW"
+VERSION = 1
+FORMATS = ("RGBA", "BGRA", "ARGB")
+# magic, version, format index, width, height, source mtime_ns, source bytes, source sha256
+HEADER = struct.Struct("<4sHHIIQQ32s")
+assert HEADER.size == 64
+
+SourceInfo = Tuple[int, int, bytes]  # (mtime_ns, bytes, sha256 digest)
+
+
+def source_info(path: str, digest: Optional[bytes] = None) -> SourceInfo:
+    st = os.stat(path)
+    if digest is None:
+        digest = sha256_digest(path)
+    return st.st_mtime_ns, st.st_size, digest
+
+
+def sha256_digest(path: str) -> bytes:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.digest()
+
+
+def native_format() -> str:
+    """Byte order of ``convert_alpha()`` surfaces; guessed when there is no window yet."""
+    if pygame.display.get_surface() is not None:
+        masks = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha().get_masks()
+        for fmt in FORMATS:
+            if _masks(fmt) == tuple(masks):
+                return fmt
+    # SDL's usual ARGB8888 display format
+    return "BGRA" if sys.byteorder == "little" else "ARGB"
+
+
+def _masks(fmt: str) -> Tuple[int, int, int, int]:
+    """(R, G, B, A) masks of a 32-bit pixel laid out as ``fmt`` in memory."""
+    shifts = {c: 8 * (i if sys.byteorder == "little" else 3 - i) for i, c in enumerate(fmt)}
+    return tuple(0xFF << shifts[c] for c in "RGBA")
+
+
+def write_raw(path: str, surface: pygame.Surface, source: SourceInfo, fmt: Optional[str] = None) -> None:
+    """Store ``surface`` pixels in ``path`` (atomically, via a temporary file)."""
+    fmt = fmt or native_format()
+    write_raw_bytes(path, pygame.image.tobytes(surface, fmt), surface.get_size(), fmt, source)
+
+
+def write_raw_bytes(path: str, pixels: bytes, size: Tuple[int, int], fmt: str, source: SourceInfo) -> None:
+    """Like ``write_raw`` for pixels already laid out as ``fmt``."""
+    w, h = size
+    mtime_ns, source_size, digest = source
+    header = HEADER.pack(MAGIC, VERSION, FORMATS.index(fmt), w, h, mtime_ns, source_size, digest)
+    # per process and thread: several may write the same file at once
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(pixels)
+    os.replace(tmp, path)
+
+
+def read_header(path: str) -> Optional[Tuple[str, int, int, SourceInfo]]:
+    """(format, width, height, source info) or None if the file is missing or not a raw file."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read(HEADER.size)
+    except OSError:
+        return None
+    if len(data) != HEADER.size:
+        return None
+    magic, version, fmt, w, h, mtime_ns, size, digest = HEADER.unpack(data)
+    if magic != MAGIC or version != VERSION or fmt >= len(FORMATS):
+        return None
+    return FORMATS[fmt], w, h, (mtime_ns, size, digest)
+
+
+def is_fresh(stored: SourceInfo, source_path: str, raw_path: Optional[str] = None) -> bool:
+    """Source unchanged: same mtime and size, or (after a touch/checkout) the same content.
+
+    When only the mtime differed, the new mtime is written into ``raw_path``'s
+    header, so the source is hashed once per checkout rather than on every start.
+    """
+    try:
+        st = os.stat(source_path)
+    except OSError:
+        return False
+    mtime_ns, size, digest = stored
+    if st.st_size != size:
+        return False
+    if st.st_mtime_ns == mtime_ns:
+        return True
+    if sha256_digest(source_path) != digest:
+        return False
+    if raw_path is not None:
+        _update_source_mtime(raw_path, st.st_mtime_ns)
+    return True
+
+
+def _update_source_mtime(raw_path: str, mtime_ns: int) -> None:
+    offset = HEADER.size - struct.calcsize("<QQ32s")
+    try:
+        with open(raw_path, "r+b") as f:
+            f.seek(offset)
+            f.write(struct.pack("<Q", mtime_ns))
+    except OSError as e:
+        print("raw cache error:", raw_path, e)
+
+
+def load_raw(path: str) -> Optional[pygame.Surface]:
+    """Map a raw file into a surface without copying. None if the file is unusable."""
+    header = read_header(path)
+    if header is None:
+        return None
+    fmt, w, h, _ = header
+    try:
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (OSError, ValueError):
+        return None
+    end = HEADER.size + w * h * 4
+    if len(mapped) < end:
+        mapped.close()
+        return None
+    # the surface keeps a reference to the buffer, so the mapping lives as long as it does
+    surface = pygame.image.frombuffer(memoryview(mapped)[HEADER.size:end], (w, h), fmt)
+    if pygame.display.get_surface() is not None and fmt != native_format():
+        surface = surface.convert_alpha()
+    return surface
+
+
+class RawPixelCache:
+    """Raw copies of decoded source images, one file per source path."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._queue: "queue.Queue[Tuple[str, bytes, Tuple[int, int], str]]" = queue.Queue()
+        self._queued: Set[str] = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def file_for(self, source_path: str) -> str:
+        name = hashlib.sha1(source_path.encode("utf-8")).hexdigest()[:20]
+        return os.path.join(self.directory, name + ".raw")
+
+    def load(self, source_path: str) -> Optional[pygame.Surface]:
+        raw_path = self.file_for(source_path)
+        header = read_header(raw_path)
+        if header is None or not is_fresh(header[3], source_path, raw_path):
+            return None
+        return load_raw(raw_path)
+
+    def store(self, source_path: str, surface: pygame.Surface) -> None:
+        """Remember decoded pixels for later processes, written in the background.
+
+        Only the pixels are copied here; write errors are not fatal.
+        """
+        with self._lock:
+            if source_path in self._queued:
+                return
+            self._queued.add(source_path)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="raw-pixels", daemon=True)
+                self._thread.start()
+        try:
+            # the surface may be blitted meanwhile, so the writer gets a copy of the pixels
+            fmt = native_format()
+            pixels = pygame.image.tobytes(surface, fmt)
+        except pygame.error as e:
+            print("raw cache error:", source_path, e)
+            with self._lock:
+                self._queued.discard(source_path)
+            return
+        self._queue.put((source_path, pixels, surface.get_size(), fmt))
+
+    def flush(self) -> None:
+        """Wait until every stored image is on disk."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            source_path, pixels, size, fmt = self._queue.get()
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                write_raw_bytes(self.file_for(source_path), pixels, size, fmt, source_info(source_path))
+            except Exception as e:
+                print("raw cache error:", source_path, e)
+            finally:
+                with self._lock:
+                    self._queued.discard(source_path)
+                self._queue.task_done()
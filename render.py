@@ -1,11 +1,18 @@
-from functools import cmp_to_key
 
 import pygame
 import sys
 import scenes
-from scene import Scene
+from scene import TICK_DT, Scene, set_voice_prefetch
 from data_helper import *
-from scenes import scene1
+import scene_snapshot
+from sprite_cache import SPRITE_CACHE, get_sprite
+from text_cache import render_text
+from dialog_layout import DialogLayoutCache
+from inventory_view import InventoryView
+from asset_preloader import Asset, AssetPreloader, scene_assets
+from sound_cache import SoundCache
+from layers import SceneLayers, screen_rect
+from frame_timing import FRAME_TIMER
 
 # --- голос/озвучка ---
 pygame.mixer.pre_init(44100, -16, 2, 512)
@@ -16,20 +23,38 @@ pygame.mixer.init()
 VOICE_ENABLED = True
 VOICE_VOLUME = 0.85
 AUTO_ADVANCE_DIALOG = False  # если True — авто-переход к следующей реплике после окончания звука
+DIRTY_RECTS = True  # обновлять только изменившиеся области экрана вместо flip() целиком
+FRAME_TIMING = False  # собирать время фаз кадра всегда, а не только при открытом оверлее (F3)
+SHOW_TIMING = False   # оверлей с таймингами (F3), F4 — выгрузить буфер в CSV
+TIMING_CSV_PATH = "frame_times.csv"
+FRAME_TIMER.enabled = FRAME_TIMING
 
 VOICE_CHANNEL = pygame.mixer.Channel(5)      # отдельный канал под озвучку
 VOICE_END_EVENT = pygame.USEREVENT + 7       # событие «озвучка завершилась»
-VOICE_CACHE = {}                             # кэш звуков по пути
+VOICE_CACHE_BYTES = 32 * 1024 * 1024        # бюджет памяти под распакованные звуки
+VOICE_SOUNDS = SoundCache(VOICE_CACHE_BYTES)  # кэш звуков по пути (LRU)
+
+def _load_voice(path: str) -> pygame.mixer.Sound:
+    return VOICE_SOUNDS.get(path)
+
+def _pin_assets(assets):
+    """Закрепить в кэшах спрайты и озвучку сцены, чтобы они не вытеснялись, пока мы в ней.
+
+    Предзагрузка соседних сцен иначе вытеснила бы из SPRITE_CACHE текущую.
+    """
+    SPRITE_CACHE.set_pinned((a.path, a.size) for a in assets if a.kind == "texture")
+    VOICE_SOUNDS.set_pinned(a.path for a in assets if a.kind == "sound")
+
+
+def _pin_scene_assets(scene):
+    _pin_assets(scene_assets(scene, SCALE, _icon_sizes()))
 
 def _play_voice(path: Optional[str]):
     VOICE_CHANNEL.stop()
     if not VOICE_ENABLED or not path:
         return
     try:
-        snd = VOICE_CACHE.get(path)
-        if snd is None:
-            snd = pygame.mixer.Sound(path)
-            VOICE_CACHE[path] = snd
+        snd = _load_voice(path)
         VOICE_CHANNEL.set_volume(VOICE_VOLUME)
         VOICE_CHANNEL.play(snd)
         VOICE_CHANNEL.set_endevent(VOICE_END_EVENT)
@@ -40,12 +65,17 @@ def _play_voice(path: Optional[str]):
 _last_ui_mode = None
 _last_dialog_text = None
 _last_voice_path = None
+_voice_scene = None  # сцена, чья озвучка закреплена в VOICE_SOUNDS
+_saved_scene = None  # последняя автосохранённая сцена
 
 info = pygame.display.Info()
 WIDTH = info.current_w
 HEIGHT = int(WIDTH / 16 * 9)
 SCALE = HEIGHT / 279
-FPS = 30
+FPS = 30  # стартовый экран
+RENDER_FPS = 60  # предел частоты отрисовки игры; 0 — без ограничения. Скорость игры от него не зависит
+MAX_TICKS_PER_FRAME = 5  # при сильных тормозах не догоняем логику бесконечно
+EXIT_SAVE_TIMEOUT = 5.0  # сколько ждать записи сохранений при выходе (с)
 DIALOG_COLOR = (246, 235, 165)
 TEXT_COLOR = (41, 43, 51)
 DIALOG_HEIGHT = int(HEIGHT / 5)
@@ -63,18 +93,18 @@ TEXT_PADDING = HEIGHT / 80
 LETTER_SIZE = HEIGHT / 30
 
 class Notification:
-    def __init__(self, text: str, frames_left: int, sound_path: Optional[str]):
+    def __init__(self, text: str, ticks_left: int, sound_path: Optional[str]):
         self.text = text
-        self.frames_left = frames_left
+        self.ticks_left = ticks_left  # в логических тиках, не в кадрах отрисовки
         self.sound_path = sound_path
 
 notifications_list = []
 
-def add_notification(text: str, sound_path: Optional[str], frame_left: int = 50):
+def add_notification(text: str, sound_path: Optional[str], ticks_left: int = 50):
     global notifications_list
     if sound_path:
         _play_voice(sound_path)
-    notifications_list.append(Notification(text, frame_left, sound_path))
+    notifications_list.append(Notification(text, ticks_left, sound_path))
 
 def draw_hud(label="Q-открыть/закрыть словарь", margin_h_ratio=0.03):
     """
@@ -84,7 +114,7 @@ def draw_hud(label="Q-открыть/закрыть словарь", margin_h_ra
     W, H = WIDTH, HEIGHT
     margin = int(H * margin_h_ratio)
 
-    text = DIALOG_FONT.render(label, True, TEXT_COLOR)
+    text = render_text(DIALOG_FONT, label, TEXT_COLOR)
 
     # Отступы внутри белого окошка — тоже от высоты
     pad_y = max(2, int(H * 0.006))
@@ -103,76 +133,131 @@ def draw_hud(label="Q-открыть/закрыть словарь", margin_h_ra
 
     # Текст
     screen.blit(text, text_rect)
-def draw_notifications():
+    return bg_rect
+
+def update_notifications():
+    """Один логический тик: уменьшить счётчики и убрать истёкшие уведомления."""
     global notifications_list
     active_notifications = []
     for notification in notifications_list:
-        notification.frames_left -= 1
-        if notification.frames_left > 0:
+        notification.ticks_left -= 1
+        if notification.ticks_left > 0:
             active_notifications.append(notification)
+    notifications_list = active_notifications
+
 
+def draw_notifications():
+    """Нарисовать активные уведомления, вернуть список занятых ими прямоугольников."""
+    active_notifications = notifications_list
+    rects = []
     for i in range(len(active_notifications)):
         base = E_SIZE + NOTIFICATION_PADDING + i * (NOTIFICATION_PADDING + NOTIFICATION_SIZE)
         width = TEXT_PADDING * 2 + LETTER_SIZE * len(active_notifications[i].text)
-        text = DIALOG_FONT.render(active_notifications[i].text, True, TEXT_COLOR)
+        text = render_text(DIALOG_FONT, active_notifications[i].text, TEXT_COLOR)
         rect = text.get_rect(center=(width / 2, base + NOTIFICATION_SIZE / 2))
         out_rect = pygame.Rect(0, base, width, NOTIFICATION_SIZE)
         pygame.draw.rect(screen, DIALOG_COLOR, out_rect, border_radius=10)
         pygame.draw.rect(screen, BORDER_COLOR, out_rect, border_radius=10, width=BORDER_WIDTH)
         screen.blit(text, rect)
+        rects.append(out_rect)
+    return rects
 
-    notifications_list = active_notifications
+
+INVENTORY_VIEW = InventoryView(DIALOG_FONT, TEXT_COLOR, DIALOG_COLOR, BORDER_COLOR, BORDER_WIDTH)
+
+
+def draw_inventory(items, version):
+    """Отрисовка окна инвентаря (готовая страница из кэша)."""
+    screen.blit(INVENTORY_VIEW.surface(items, version, (WIDTH, HEIGHT)), (0, 0))
 
 
-def draw_inventory(items):
-    """Отрисовка окна инвентаря."""
-    inv_rect = pygame.Rect(0, 0, WIDTH, HEIGHT)
-    pygame.draw.rect(screen, DIALOG_COLOR, inv_rect)
-    pygame.draw.rect(screen, BORDER_COLOR, inv_rect, width=BORDER_WIDTH)
-
-    item_size = int(HEIGHT / 6)
-    padding = int(item_size * 0.5)
-    font_h = DIALOG_FONT.get_height()
-    cols = max(1, (WIDTH - padding) // (item_size + padding))
-    for i, item in enumerate(items):
-        word = item["word"]
-        path = item["texture_path"]
-        sprite = pygame.image.load(path).convert_alpha()
-        sprite = pygame.transform.scale(sprite, (item_size, item_size))
-        col = i % cols
-        row = i // cols
-        x = padding + col * (item_size + padding)
-        y = padding + row * (item_size + font_h + padding)
-        screen.blit(sprite, (x, y))
-        text_surface = DIALOG_FONT.render(word, True, TEXT_COLOR)
-        text_rect = text_surface.get_rect(center=(x + item_size // 2, y + item_size + font_h // 2))
-        screen.blit(text_surface, text_rect)
-
-
-def draw_dialog(text, items):
+DIALOG_LAYOUTS = DialogLayoutCache()
+
+
+def draw_dialog(text, items, inventory_version):
     """Отрисовать диалог с картинками под словами из словаря."""
-    dialog_rect = pygame.Rect(0, HEIGHT - DIALOG_HEIGHT, WIDTH, DIALOG_HEIGHT)
-    pygame.draw.rect(screen, DIALOG_COLOR, dialog_rect, border_radius=20)
-    pygame.draw.rect(screen, BORDER_COLOR, dialog_rect, border_radius=20, width=BORDER_WIDTH)
-
-    words = text.split()
-    space_w = DIALOG_FONT.size(" ")[0]
-    surfaces = [DIALOG_FONT.render(w, True, TEXT_COLOR) for w in words]
-    total_w = sum(s.get_width() for s in surfaces) + space_w * max(0, len(surfaces) - 1)
-    x = (WIDTH - total_w) // 2
-    y_text = dialog_rect.y + (DIALOG_HEIGHT - DIALOG_FONT.get_height()) // 2
-
-    inventory_map = {item["word"].lower(): item["texture_path"] for item in items}
-    for w, surf in zip(words, surfaces):
-        screen.blit(surf, (x, y_text))
-        clean = w.strip(".,!?;:\"'").lower()
-        if clean in inventory_map:
-            img = pygame.image.load(inventory_map[clean]).convert_alpha()
-            img_size = DIALOG_FONT.get_height()
-            img = pygame.transform.scale(img, (img_size, img_size))
-            img_rect = img.get_rect(center=(x + surf.get_width() // 2, y_text + surf.get_height() + img_size // 2 + 5))
-            screen.blit(img, img_rect)
-        x += surf.get_width() + space_w
+    layout = DIALOG_LAYOUTS.get(
+        text, items, inventory_version, (WIDTH, HEIGHT),
+        font=DIALOG_FONT, color=TEXT_COLOR, box_height=DIALOG_HEIGHT,
+        max_line_width=WIDTH - 2 * int(NOTIFICATION_PADDING),
+    )
+    pygame.draw.rect(screen, DIALOG_COLOR, layout.box, border_radius=20)
+    pygame.draw.rect(screen, BORDER_COLOR, layout.box, border_radius=20, width=BORDER_WIDTH)
+    screen.blits(layout.words, False)
+    screen.blits(layout.icons, False)
+    return layout.bounds
+
+
+def draw_scene(sorted_objects, area=None):
+    """Фон + передний слой + игрок. Если задан area — перерисовать только его."""
+    screen.set_clip(area)
+    if area is None:
+        screen.blit(LAYERS.background, (0, 0))
+    else:
+        screen.blit(LAYERS.background, area, area)
+    for obj in sorted_objects:
+        if obj.texture_path is None:
+            continue
+        rect = screen_rect(obj.rect, SCALE)
+        if area is not None and not rect.colliderect(area):
+            continue
+        screen.blit(get_sprite(obj.texture_path, rect.size), rect)
+    screen.set_clip(None)
+
+
+TIMING_FONT = pygame.font.SysFont("consolas", max(10, int(HEIGHT / 45)))
+TIMING_REFRESH_FRAMES = 15  # как часто пересчитывать текст оверлея
+_timing_surface = None
+_timing_age = 0
+
+def draw_timing_overlay():
+    """Таблица фаз кадра (avg/p95/p99, мс) и реальный FPS в левом нижнем углу."""
+    global _timing_surface, _timing_age
+    _timing_age -= 1
+    if _timing_surface is None or _timing_age <= 0:
+        stats = FRAME_TIMER.summary()
+        lines = [f"{'phase':<17}{'avg':>7}{'p95':>7}{'p99':>7}"]
+        for name in FRAME_TIMER.phases + ("frame",):
+            if name in stats:
+                st = stats[name]
+                lines.append(f"{name:<17}{st['avg']:7.2f}{st['p95']:7.2f}{st['p99']:7.2f}")
+        if "fps" in stats:
+            lines.append(f"fps {stats['fps']['avg']:.1f}")
+        sprites, sounds = SPRITE_CACHE.stats(), VOICE_SOUNDS.stats()
+        lines.append(f"sprites {sprites['entries']} / {sprites['bytes'] / 2**20:.1f} MB, pinned {sprites['pinned']}")
+        lines.append(f"sounds  {sounds['entries']} / {sounds['bytes'] / 2**20:.1f} MB, pinned {sounds['pinned']}")
+        line_h = TIMING_FONT.get_linesize()
+        w = max(TIMING_FONT.size(l)[0] for l in lines) + 8
+        _timing_surface = pygame.Surface((w, line_h * len(lines) + 8))
+        _timing_surface.fill((0, 0, 0))
+        for i, line in enumerate(lines):
+            _timing_surface.blit(render_text(TIMING_FONT, line, (230, 230, 230)), (4, 4 + i * line_h))
+        _timing_age = TIMING_REFRESH_FRAMES
+    rect = _timing_surface.get_rect(bottomleft=(0, HEIGHT))
+    screen.blit(_timing_surface, rect)
+    return rect
+
+
+def draw_ui(state):
+    """Всё, что поверх сцены. Возвращает прямоугольники нарисованного."""
+    rects = []
+    if state.inventory_open:
+        draw_inventory(state.inventory_items, state.inventory_version)
+    elif state.ui_mode == "dialog":
+        rects.append(draw_dialog(state.ui_text, state.inventory_items, state.inventory_version))
+    else:
+        if state.ui_mode == "hint":
+            screen.blit(E_SPRITE, E_RECT)
+            rects.append(E_RECT)
+    FRAME_TIMER.mark("dialog_inventory")
+
+    rects.extend(draw_notifications())
+    FRAME_TIMER.mark("notifications")
+    rects.append(draw_hud())
+    if SHOW_TIMING:
+        rects.append(draw_timing_overlay())
+    FRAME_TIMER.mark("hud")
+    return rects
 
 # --- START SCREEN (assets & geometry) ---
 # Координаты кнопки в "игровых" пикселях 496x279 (масштабируем через SCALE)
@@ -188,46 +273,96 @@ START_BTN_PATH_CANDIDATES = [
 def _first_existing_image(candidates):
     for p in candidates:
         try:
-            pygame.image.load(p)  # just to check it exists/loads
+            get_sprite(p)  # just to check it exists/loads (и заодно прогреть кэш)
             return p
         except Exception:
             continue
     raise FileNotFoundError("Не найдено изображение стартового экрана. Проверь пути.")
 
-def run_start_screen(screen, clock):
-    """Показывает стартовый экран. Возвращает True если начали игру, False если вышли."""
+def _icon_sizes():
+    """Размеры, в которых рисуются картинки слов: под словами в диалоге и в словаре."""
+    return [
+        (DIALOG_FONT.get_height(), DIALOG_FONT.get_height()),
+        (INVENTORY_VIEW.grid((WIDTH, HEIGHT), DIALOG_FONT.get_height())[0],) * 2,
+    ]
+
+
+def _preload_groups(scene_id, pin=False):
+    """Группы для PRELOADER: сама сцена, потом сцены, куда из неё можно перейти.
+
+    Остальные сцены не грузим: все сразу не помещаются в SPRITE_CACHE и
+    вытеснили бы текущую. Сцены для списков ассетов собираются в пуле.
+    С ``pin`` ассеты первой группы ещё и закрепляются — тем же списком,
+    без отдельной сборки сцены в главном потоке.
+    """
+    icon_sizes = _icon_sizes()
+
+    def assets(group_id, pin_group):
+        def build():
+            group = scene_assets(scenes.scenes.get_scene(group_id, "fresh"), SCALE, icon_sizes)
+            if pin_group:
+                _pin_assets(group)
+            return group
+        return build
+
+    for group_id in [scene_id] + scenes.next_scene_ids(scene_id):
+        yield group_id, assets(group_id, pin and group_id == scene_id)
+
+
+def draw_preload_progress(preloader):
+    """Полоска загрузки внизу стартового экрана."""
+    done, total = preloader.progress()
+    if not total or done >= total:
+        return
+    bar = pygame.Rect(0, 0, WIDTH // 3, max(4, int(HEIGHT / 90)))
+    bar.midbottom = (WIDTH // 2, HEIGHT - int(6 * SCALE))
+    pygame.draw.rect(screen, DIALOG_COLOR, bar)
+    pygame.draw.rect(screen, BORDER_COLOR, (bar.x, bar.y, bar.w * done // total, bar.h))
+    label = render_text(TIMING_FONT, f"Загрузка {done}/{total}", DIALOG_COLOR)
+    screen.blit(label, label.get_rect(midbottom=(bar.centerx, bar.y - 2)))
+
+
+def run_start_screen(screen, clock, preloader=None, first_scene_id=None):
+    """Показывает стартовый экран. Возвращает True если начали игру, False если вышли.
+
+    Если передан preloader — рисует прогресс загрузки, а после нажатия ENTER
+    ждёт только ассеты первой сцены (остальное догружается в фоне).
+    """
     bg_path = _first_existing_image(START_BG_PATH_CANDIDATES)
     btn_path = _first_existing_image(START_BTN_PATH_CANDIDATES)
 
-    bg_img = pygame.image.load(bg_path).convert_alpha()
-    bg_img = pygame.transform.scale(bg_img, (WIDTH, HEIGHT))
+    bg_img = get_sprite(bg_path, (WIDTH, HEIGHT))
 
     # Масштабируем кнопку из координат 496x279 под текущее окно
     br = START_BUTTON_RECT_GAME
     btn_w, btn_h = int(br.w * SCALE), int(br.h * SCALE)
     btn_x, btn_y = int(br.x * SCALE), int(br.y * SCALE)
-    btn_img = pygame.image.load(btn_path).convert_alpha()
-    btn_img = pygame.transform.scale(btn_img, (btn_w, btn_h))
+    btn_img = get_sprite(btn_path, (btn_w, btn_h))
     btn_rect = pygame.Rect(btn_x, btn_y, btn_w, btn_h)
 
     # (опционально) текстовая подсказка
     tip_font = pygame.font.SysFont("consolas", int(HEIGHT / 28))
-    tip_surf = tip_font.render("Нажмите ENTER или клик по кнопке", True, (0, 0, 0))
+    tip_surf = render_text(tip_font, "Нажмите ENTER или клик по кнопке", (0, 0, 0))
     tip_rect = tip_surf.get_rect(midbottom=(WIDTH // 2 + 300, HEIGHT - int(20 * SCALE)))
 
+    started = False
     while True:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False
             if event.type == pygame.KEYDOWN and event.key in (pygame.K_RETURN, pygame.K_SPACE, pygame.K_e):
-                return True
+                started = True
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if btn_rect.collidepoint(event.pos):
-                    return True
+                    started = True
+        if started and (preloader is None or preloader.is_done(first_scene_id)):
+            return True
 
         screen.blit(bg_img, (0, 0))
         screen.blit(btn_img, btn_rect)
         screen.blit(tip_surf, tip_rect)
+        if preloader is not None:
+            draw_preload_progress(preloader)
         pygame.display.flip()
         clock.tick(FPS)
 
@@ -236,140 +371,235 @@ def run_start_screen(screen, clock):
 screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.DOUBLEBUF)
 pygame.display.set_caption("Checheck game")
 clock = pygame.time.Clock()
-# Сначала показываем стартовый экран
-started = run_start_screen(screen, clock)
-if not started:
-    pygame.quit()
-    sys.exit()
+LAYERS = SceneLayers((WIDTH, HEIGHT), SCALE)
+PRELOADER = AssetPreloader(get_sprite, _load_voice)
 
-# После старта — грузим сейв и заходим в игру
-data = load_game()
-print(data)
-if False and isinstance(data.get("scene"), str) and data["scene"] in scenes.scenes:
-    current_scene: Scene = scenes.scenes[data["scene"]]
-else:
-    current_scene: Scene = scene1()
-def cmp_objects(obj1, obj2):
-    if obj1["z"] < obj2["z"]:
-        return -1
-    if obj1["z"] > obj2["z"]:
-        return 1
-    if obj1["rect"].y2 < obj2["rect"].y2:
-        return -1
-    return 1
-
-running = True
-while running:
-    # ---------- события ----------
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-        # Авто-переход к следующей реплике, когда закончилась озвучка
-        elif event.type == VOICE_END_EVENT and AUTO_ADVANCE_DIALOG and current_scene.text_window.mode == "dialog":
-            VOICE_CHANNEL.stop()
-            res = current_scene.interact()   # то же, что нажать E
-            if res:
-                current_scene = res
-
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:
-                save_game(current_scene.get_name())
-                running = False
 
-            elif event.key == pygame.K_e:
-                # при листании диалога глушим текущий голос, потом переключаем реплику
-                VOICE_CHANNEL.stop()
-                res = current_scene.interact()
-                if res:
-                    current_scene = res
+def _prefetch_voice(path):
+    """Декодировать озвучку заранее в фоне, если её ещё нет в кэше."""
+    if path not in VOICE_SOUNDS:
+        PRELOADER.prefetch(Asset("sound", path))
 
-            elif event.key == pygame.K_q:
-                current_scene.toggle_inventory()
 
-            # ---- управление звуком (по желанию) ----
-            elif event.key == pygame.K_m:
-                VOICE_CHANNEL.stop()
-                VOICE_ENABLED = not VOICE_ENABLED
-            elif event.key == pygame.K_LEFTBRACKET:   # [
-                VOICE_VOLUME = max(0.0, VOICE_VOLUME - 0.1); VOICE_CHANNEL.set_volume(VOICE_VOLUME)
-            elif event.key == pygame.K_RIGHTBRACKET:  # ]
-                VOICE_VOLUME = min(1.0, VOICE_VOLUME + 0.1); VOICE_CHANNEL.set_volume(VOICE_VOLUME)
-
-        elif event.type == pygame.MOUSEBUTTONDOWN:
-            if event.button == 1:
-                x, y = event.pos
-                x /= SCALE
-                y /= SCALE
-                print("process click:", x, y)
-                word, voice_path = current_scene.process_click(int(x), int(y))
-                if word:
-                    add_notification(f"Добавлено новое слово: {word}", voice_path)
-
-
-    # ---------- управление персонажем ----------
-    keys = pygame.key.get_pressed()
-    if not current_scene.inventory_open and current_scene.text_window.mode != "dialog":
-        if keys[pygame.K_w] or keys[pygame.K_UP]:
-            current_scene.move_forward()
-        if keys[pygame.K_s] or keys[pygame.K_DOWN]:
-            current_scene.move_back()
-        if keys[pygame.K_a] or keys[pygame.K_LEFT]:
-            current_scene.move_left()
-        if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
-            current_scene.move_right()
-
-    # ---------- логика сцены и отрисовка ----------
-    scene_info = current_scene.get_draw_data()
-    screen.fill((0, 0, 0))
-
-    # Порядок отрисовки объектов + игрок
-    sorted_objects = scene_info["objects"] + [scene_info["player"]]
-    sorted_objects.sort(key=cmp_to_key(cmp_objects))
+set_voice_prefetch(_prefetch_voice)
 
-    for obj in sorted_objects:
-        rect = obj["rect"]
-        x_l = int(rect.x1 * SCALE)
-        y_t = int(rect.y1 * SCALE)
-        width = int((rect.x2 - rect.x1) * SCALE)
-        height = int((rect.y2 - rect.y1) * SCALE)
-
-        if obj["texture_path"] is not None:
-            sprite = pygame.image.load(obj["texture_path"]).convert_alpha()
-            sprite = pygame.transform.scale(sprite, (width, height))
-            rect = sprite.get_rect(topleft=(x_l, y_t))
-            screen.blit(sprite, rect)
-
-    # ---------- авто-проигрывание озвучки по смене строки ----------
-    ui = scene_info["ui"]
-    if _last_ui_mode == "dialog" and ui["mode"] != "dialog":
-        VOICE_CHANNEL.stop()  # вышли из диалога — остановить голос
-
-    if ui["mode"] == "dialog":
-        if ui["text"] != _last_dialog_text or ui.get("voice_path") != _last_voice_path:
-            _play_voice(ui.get("voice_path"))  # voice_path задаётся в сценах для конкретной реплики
-
-    _last_ui_mode = ui["mode"]
-    _last_dialog_text = ui["text"] if ui["mode"] == "dialog" else None
-    _last_voice_path = ui.get("voice_path") if ui["mode"] == "dialog" else None
-
-    # ---------- поверх — UI ----------
-    if scene_info["inventory"]["open"]:
-        draw_inventory(scene_info["inventory"]["items"])
-    elif scene_info["ui"]["mode"] == "dialog":
-        draw_dialog(scene_info["ui"]["text"], scene_info["inventory"]["items"])
-    else:
-        if scene_info["ui"]["mode"] == "hint":
-            screen.blit(E_SPRITE, E_RECT)
-
-    draw_notifications()
-    draw_hud()
-    pygame.display.flip()
-    clock.tick(FPS)
-
-pygame.quit()
-sys.exit()
+# состояние для частичной перерисовки экрана
+_last_frame_state = None
+_last_inventory_open = False
+_prev_player_rect = None
+_prev_ui_rects = []
 
+def draw_frame(scene, full=False, alpha=1.0):
+    """Отрисовать один кадр сцены и вывести его на экран. Возвращает RenderState сцены.
 
+    full=True — принудительная полная перерисовка (как при смене сцены).
+    alpha — доля времени до следующего логического тика: игрок рисуется
+    между позициями прошлого и текущего тика.
+    """
+    global _last_frame_state, _last_inventory_open, _prev_player_rect, _prev_ui_rects
+    state = scene.render_state(alpha)
+    FRAME_TIMER.mark("render_state")
+    # Запечённый фон вместо заливки и отрисовки всех статичных объектов
+    layers_changed = LAYERS.update(state)
+    FRAME_TIMER.mark("layers")
+
+    # Передний слой хранится упорядоченным — переставляется только игрок
+    sorted_objects = LAYERS.draw_order(state.player)
+    FRAME_TIMER.mark("sort")
+
+    # ---------- отрисовка сцены и UI ----------
+    inventory_open = state.inventory_open
+    player_rect = screen_rect(state.player.rect, SCALE)
+    frame_state = (
+        tuple(player_rect), state.player.texture_path,
+        state.ui_mode, state.ui_text, inventory_open, state.inventory_version, INVENTORY_VIEW.page,
+        tuple(n.text for n in notifications_list),
+    )
+    # Полная перерисовка — при смене сцены/фона и открытии или закрытии инвентаря
+    full_repaint = full or not DIRTY_RECTS or layers_changed or inventory_open != _last_inventory_open
+
+    if full_repaint or frame_state != _last_frame_state or SHOW_TIMING:
+        if full_repaint or inventory_open:
+            if not inventory_open:  # словарь закрывает весь экран
+                draw_scene(sorted_objects)
+            FRAME_TIMER.mark("blits")
+            ui_rects = draw_ui(state)
+            pygame.display.flip()
+        else:
+            # Восстанавливаем из фона то, что было под игроком и UI, и рисуем заново
+            dirty = _prev_ui_rects + [player_rect]
+            if _prev_player_rect is not None:
+                dirty.append(_prev_player_rect)
+            for area in dirty:
+                draw_scene(sorted_objects, area)
+            FRAME_TIMER.mark("blits")
+            ui_rects = draw_ui(state)
+            pygame.display.update(dirty + ui_rects)
+        FRAME_TIMER.mark("flip")
+        _prev_ui_rects = ui_rects
+        _prev_player_rect = player_rect
+        _last_frame_state = frame_state
+    _last_inventory_open = inventory_open
+    return state
+
+
+def _saved_scene_id() -> str:
+    """Сцена из data.json; для новой игры — первая."""
+    scene_id = load_scene_name()
+    return scene_id if scene_id in scenes.scenes else "scene1"
+
+
+def _start_scene(snapshot) -> Scene:
+    """Сцена, с которой начинается игра: из снимка, а если он не подошёл — из data.json."""
+    if snapshot is not None:
+        try:
+            return scene_snapshot.resume(snapshot, scenes.scenes)
+        except Exception as e:
+            print("snapshot not resumed:", e)
+    return scenes.scenes.get_scene(_saved_scene_id(), "fresh")
+
+
+if __name__ == "__main__":
+    # Снимок сохранения читаем сразу: ассеты сцены, с которой продолжим, грузятся первыми
+    snapshot = scene_snapshot.read_saved(scenes.scenes)
+    first_scene_id = snapshot.scene_id if snapshot is not None else _saved_scene_id()
+
+    # Сначала показываем стартовый экран, а в фоне грузим ассеты первой сцены и соседних.
+    # Первую сцену закрепляем, как только готов её список ассетов, чтобы соседние
+    # не вытеснили её ещё до старта
+    PRELOADER.start(_preload_groups(first_scene_id, pin=True))
+    started = run_start_screen(screen, clock, PRELOADER, first_scene_id)
+    if not started:
+        PRELOADER.shutdown()
+        pygame.quit()
+        sys.exit()
+
+    # После старта — продолжаем с сохранённого состояния или начинаем заново
+    current_scene: Scene = _start_scene(snapshot)
+
+    running = True
+    accumulator = 0.0  # время, ещё не отработанное логическими тиками (с)
+    while running:
+        FRAME_TIMER.begin_frame()
+        # ---------- события ----------
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                scene_snapshot.save(current_scene)
+                flush_saves(EXIT_SAVE_TIMEOUT)
+                running = False
 
+            # Авто-переход к следующей реплике, когда закончилась озвучка
+            elif event.type == VOICE_END_EVENT and AUTO_ADVANCE_DIALOG and current_scene.text_window.mode == "dialog":
+                VOICE_CHANNEL.stop()
+                res = current_scene.interact()   # то же, что нажать E
+                if res:
+                    current_scene = res
 
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    save_game(current_scene.get_name())
+                    scene_snapshot.save(current_scene)
+                    flush_saves(EXIT_SAVE_TIMEOUT)
+                    running = False
+
+                elif event.key == pygame.K_e:
+                    # при листании диалога глушим текущий голос, потом переключаем реплику
+                    VOICE_CHANNEL.stop()
+                    res = current_scene.interact()
+                    if res:
+                        current_scene = res
+
+                elif event.key == pygame.K_q:
+                    current_scene.toggle_inventory()
+
+                # ---- листание словаря ----
+                elif current_scene.inventory_open and event.key in (pygame.K_LEFT, pygame.K_a, pygame.K_PAGEUP):
+                    INVENTORY_VIEW.scroll(-1)
+                elif current_scene.inventory_open and event.key in (pygame.K_RIGHT, pygame.K_d, pygame.K_PAGEDOWN):
+                    INVENTORY_VIEW.scroll(1)
+
+                # ---- управление звуком (по желанию) ----
+                elif event.key == pygame.K_m:
+                    VOICE_CHANNEL.stop()
+                    VOICE_ENABLED = not VOICE_ENABLED
+                elif event.key == pygame.K_LEFTBRACKET:   # [
+                    VOICE_VOLUME = max(0.0, VOICE_VOLUME - 0.1); VOICE_CHANNEL.set_volume(VOICE_VOLUME)
+                elif event.key == pygame.K_RIGHTBRACKET:  # ]
+                    VOICE_VOLUME = min(1.0, VOICE_VOLUME + 0.1); VOICE_CHANNEL.set_volume(VOICE_VOLUME)
+
+                # ---- замер времени кадра ----
+                elif event.key == pygame.K_F3:
+                    SHOW_TIMING = not SHOW_TIMING
+                    FRAME_TIMER.enabled = SHOW_TIMING or FRAME_TIMING
+                elif event.key == pygame.K_F4:
+                    n = FRAME_TIMER.dump_csv(TIMING_CSV_PATH)
+                    print(f"frame timings: {n} frames -> {TIMING_CSV_PATH}")
+
+            elif event.type == pygame.MOUSEWHEEL and current_scene.inventory_open:
+                INVENTORY_VIEW.scroll(-event.y)
+
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                if event.button == 1:
+                    x, y = event.pos
+                    x /= SCALE
+                    y /= SCALE
+                    word, voice_path = current_scene.process_click(int(x), int(y))
+                    if word:
+                        add_notification(f"Добавлено новое слово: {word}", voice_path)
+        FRAME_TIMER.mark("events")
+
+        # ---------- управление персонажем (фиксированные тики логики) ----------
+        keys = pygame.key.get_pressed()
+        ticks = 0
+        while accumulator >= TICK_DT and ticks < MAX_TICKS_PER_FRAME:
+            current_scene.begin_tick()
+            if not current_scene.inventory_open and current_scene.text_window.mode != "dialog":
+                if keys[pygame.K_w] or keys[pygame.K_UP]:
+                    current_scene.move_forward()
+                if keys[pygame.K_s] or keys[pygame.K_DOWN]:
+                    current_scene.move_back()
+                if keys[pygame.K_a] or keys[pygame.K_LEFT]:
+                    current_scene.move_left()
+                if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
+                    current_scene.move_right()
+            update_notifications()
+            accumulator -= TICK_DT
+            ticks += 1
+        if ticks == MAX_TICKS_PER_FRAME:
+            accumulator = min(accumulator, TICK_DT)
+        FRAME_TIMER.mark("movement")
+
+        # ---------- автосохранение при смене сцены ----------
+        if current_scene is not _saved_scene:
+            save_game(current_scene.get_name())
+            scene_snapshot.save(current_scene)  # кодируется здесь, пишется в фоне
+            _saved_scene = current_scene
+        FRAME_TIMER.mark("autosave")
+
+        # ---------- отрисовка ----------
+        state = draw_frame(current_scene, alpha=accumulator / TICK_DT)
+
+        # ---------- авто-проигрывание озвучки по смене строки ----------
+        if current_scene is not _voice_scene:
+            PRELOADER.start(_preload_groups(current_scene.id))
+            _pin_scene_assets(current_scene)
+            current_scene.prefetch_voices()
+            _voice_scene = current_scene
+        if _last_ui_mode == "dialog" and state.ui_mode != "dialog":
+            VOICE_CHANNEL.stop()  # вышли из диалога — остановить голос
+
+        if state.ui_mode == "dialog":
+            if state.ui_text != _last_dialog_text or state.voice_path != _last_voice_path:
+                _play_voice(state.voice_path)  # voice_path задаётся в сценах для конкретной реплики
+
+        _last_ui_mode = state.ui_mode
+        _last_dialog_text = state.ui_text if state.ui_mode == "dialog" else None
+        _last_voice_path = state.voice_path if state.ui_mode == "dialog" else None
+        FRAME_TIMER.mark("voice")
+        FRAME_TIMER.end_frame()
+
+        accumulator += clock.tick(RENDER_FPS) / 1000.0
+
+    PRELOADER.shutdown()
+    pygame.quit()
+    sys.exit()
@@ -0,0 +1,118 @@
+import atexit
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+def write_json_atomic(path: str, data: Dict[str, object]) -> None:
+    """Write ``data`` to ``path`` so that readers see either the old or the new file.
+
+    The JSON goes to a temporary file next to ``path``, is fsync'ed and then
+    renamed over the original.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _sync_dir(path)
+
+
+def _sync_dir(path: str) -> None:
+    """Persist a rename inside the directory of ``path``."""
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def write_bytes_atomic(path: str, data: bytes) -> None:
+    """Like ``write_json_atomic`` for already encoded data."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _sync_dir(path)
+
+
+class SaveWriter:
+    """Background writer for the save file.
+
+    ``submit`` only remembers the latest snapshot and returns immediately.
+    A worker thread waits ``delay`` seconds to let a burst of changes settle
+    and then writes the newest snapshot once with ``write(path, data)``.
+    """
+
+    def __init__(self, path: str = "data.json", delay: float = 0.25,
+                 write: Callable[[str, Any], None] = write_json_atomic):
+        self.path = path
+        self.delay = delay
+        self.write = write
+        self.writes = 0
+        self._pending: Optional[Any] = None
+        self._busy = False
+        self._flush_requested = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, data: Any) -> None:
+        with self._cond:
+            self._pending = data
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="save-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything submitted so far is on disk. False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            while self._pending is not None or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._flush_requested = False
+                    return False
+                self._cond.wait(remaining)
+            self._flush_requested = False
+        return True
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                # let a burst of changes settle into one write
+                deadline = time.monotonic() + self.delay
+                while not self._flush_requested:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                data, self._pending = self._pending, None
+                self._busy = True
+            try:
+                self.write(self.path, data)
+                self.writes += 1
+            except Exception as e:
+                # whatever goes wrong, the thread must survive or flush() would wait forever
+                print("save error:", e)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+
+SAVE_WRITER = SaveWriter()
+# binary scene snapshots (see scene_snapshot), written on every scene change
+SNAPSHOT_WRITER = SaveWriter("save.bin", write=write_bytes_atomic)
+atexit.register(SAVE_WRITER.flush, 5.0)
+atexit.register(SNAPSHOT_WRITER.flush, 5.0)
@@ -1,11 +1,37 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Callable, List, Optional, Tuple, Literal, Union, Dict, Any
-from data_helper import add_inventory_item, load_inventory
+from data_helper import add_inventory_item, get_inventory_store
+from spatial_grid import SpatialGrid
+from object_store import HAVE_NUMPY, ObjectArrays
 import math
 
 Vec2 = Tuple[float, float]
+
+# Логика идёт фиксированными тиками, независимо от частоты отрисовки
+TICK_RATE = 30  # тиков в секунду
+TICK_DT = 1.0 / TICK_RATE
 DialogLine = Union[str, Dict[str, Any]]  # {"text": "...", "voice": "path.ogg"} или просто "..."
+VoicePrefetch = Callable[[str], None]
+
+# Кто заранее декодирует озвучку (render ставит фоновую загрузку в кэш звуков).
+# Сама сцена звук не трогает — без обработчика подсказки просто игнорируются.
+_voice_prefetch: Optional[VoicePrefetch] = None
+
+
+def set_voice_prefetch(fn: Optional[VoicePrefetch]) -> None:
+    global _voice_prefetch
+    _voice_prefetch = fn
+
+
+def dialog_line_voice(line: Optional[DialogLine]) -> Optional[str]:
+    """Путь к озвучке реплики, если он задан."""
+    return line.get("voice") if isinstance(line, dict) else None
+
+
+def prefetch_voice(path: Optional[str]) -> None:
+    if path and _voice_prefetch is not None:
+        _voice_prefetch(path)
 
 # ==========================
 # Геометрия и утилиты
@@ -13,6 +39,9 @@ DialogLine = Union[str, Dict[str, Any]]  # {"text": "...", "voice": "path.ogg"}
 
 @dataclass
 class Rect:
+    # Без __dict__: прямоугольников много, и они создаются в горячих циклах.
+    # Методы *_ip и параметр out позволяют обходиться без новых объектов.
+    __slots__ = ("x1", "y1", "x2", "y2")
     x1: float
     y1: float
     x2: float
@@ -26,15 +55,47 @@ class Rect:
     def h(self) -> float:
         return self.y2 - self.y1
 
-    def moved(self, dx: float, dy: float) -> "Rect":
-        return Rect(self.x1 + dx, self.y1 + dy, self.x2 + dx, self.y2 + dy)
+    @property
+    def cx(self) -> float:
+        return (self.x1 + self.x2) * 0.5
+
+    @property
+    def cy(self) -> float:
+        return (self.y1 + self.y2) * 0.5
+
+    def set(self, x1: float, y1: float, x2: float, y2: float) -> "Rect":
+        """Переписать координаты на месте. Возвращает self."""
+        self.x1, self.y1, self.x2, self.y2 = x1, y1, x2, y2
+        return self
+
+    def moved(self, dx: float, dy: float, out: Optional["Rect"] = None) -> "Rect":
+        """Сдвинутая копия; если задан out — результат пишется в него."""
+        if out is None:
+            return Rect(self.x1 + dx, self.y1 + dy, self.x2 + dx, self.y2 + dy)
+        return out.set(self.x1 + dx, self.y1 + dy, self.x2 + dx, self.y2 + dy)
+
+    def move_ip(self, dx: float, dy: float) -> None:
+        self.x1 += dx
+        self.y1 += dy
+        self.x2 += dx
+        self.y2 += dy
 
     def intersects(self, other: "Rect") -> bool:
         return not (self.x2 <= other.x1 or self.x1 >= other.x2 or
                     self.y2 <= other.y1 or self.y1 >= other.y2)
 
-    def center(self) -> Vec2:
-        return (self.x1 + self.w * 0.5, self.y1 + self.h * 0.5)
+    def intersects_moved(self, other: "Rect", dx: float, dy: float) -> bool:
+        """То же, что ``self.moved(dx, dy).intersects(other)``, но без нового Rect."""
+        return not (self.x2 + dx <= other.x1 or self.x1 + dx >= other.x2 or
+                    self.y2 + dy <= other.y1 or self.y1 + dy >= other.y2)
+
+    def center(self, out: Optional[List[float]] = None) -> Vec2:
+        """Центр; если задан out (список из двух чисел) — пишется в него."""
+        if out is None:
+            return (self.cx, self.cy)
+        out[0] = self.cx
+        out[1] = self.cy
+        return out
 
 
 def distance_point_to_rect(px: float, py: float, r: Rect) -> float:
@@ -67,7 +128,7 @@ class TextWindow:
         self.mode = "dialog"
         if isinstance(line, dict):
             self.text = str(line.get("text", ""))
-            self.voice_path = line.get("voice")
+            self.voice_path = dialog_line_voice(line)
         else:
             self.text = str(line)
             self.voice_path = None
@@ -85,6 +146,11 @@ class TextWindow:
 # ==========================
 
 SceneFactory = Callable[[], "Scene"]
+ObjectListener = Callable[["GameObject", str], None]
+
+# Поля объекта, от которых зависят отрисовка и столкновения.
+# При их изменении объект оповещает подписчиков (сцену).
+TRACKED_FIELDS = frozenset({"rect", "solid", "interactable", "texture_path", "z", "scale_texture_to_rect"})
 
 
 @dataclass
@@ -111,6 +177,15 @@ class GameObject:
     z: int = 0
     # Если True — текстуру масштабировать под rect при отрисовке.
     scale_texture_to_rect: bool = True
+    # Подписчики на изменения TRACKED_FIELDS (см. Scene._on_object_changed)
+    _listeners: List[ObjectListener] = field(default_factory=list, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name in TRACKED_FIELDS:
+            # во время __init__ списка подписчиков ещё нет
+            for listener in self.__dict__.get("_listeners", ()):
+                listener(self, name)
 
     def on_interact(self, scene: "Scene") -> Optional["Scene"]:
         if self.next_scene_factory:
@@ -144,6 +219,12 @@ class NPC(GameObject):
     def reset_dialog(self) -> None:
         self._dialog_index = 0
 
+    def peek_dialog_line(self) -> Optional[DialogLine]:
+        """Следующая реплика без продвижения по диалогу."""
+        if self._dialog_index < len(self.dialog_lines):
+            return self.dialog_lines[self._dialog_index]
+        return None
+
     def next_dialog_line(self) -> Optional[DialogLine]:  # <— тип возвращаемого значения
         if self._dialog_index < len(self.dialog_lines):
             line = self.dialog_lines[self._dialog_index]
@@ -172,6 +253,71 @@ class StaticObject(GameObject):
     pass
 
 
+# ==========================
+# Состояние для рендера
+# ==========================
+
+class RenderRecord:
+    """Что рендеру нужно знать об одном объекте.
+
+    Запись создаётся один раз на объект и дальше обновляется на месте,
+    поэтому рендер может держать ссылки на записи между кадрами.
+    """
+    __slots__ = ("id", "rect", "texture_path", "z", "scale_to_rect", "static")
+
+    def __init__(self, id: str, rect: Rect, texture_path: Optional[str] = None, z: int = 0,
+                 scale_to_rect: bool = True, static: bool = False):
+        self.id = id
+        self.rect = rect
+        self.texture_path = texture_path
+        self.z = z
+        self.scale_to_rect = scale_to_rect
+        # неинтерактивный StaticObject — его можно запечь в фон
+        self.static = static
+
+    def fill(self, obj: GameObject) -> None:
+        self.rect = obj.rect
+        self.texture_path = obj.texture_path
+        self.z = obj.z
+        self.scale_to_rect = obj.scale_texture_to_rect
+        self.static = isinstance(obj, StaticObject) and not obj.interactable
+
+
+class RenderState:
+    """Состояние сцены для отрисовки кадра (см. ``Scene.render_state``).
+
+    - player: запись игрока, обновляется каждый кадр;
+    - objects: записи объектов в порядке ``Scene.objects``;
+    - structure_version: растёт, когда меняется состав видимых объектов
+      или то, какие из них можно запечь в фон;
+    - take_dirty(): записи, изменившиеся с прошлого вызова.
+    """
+
+    def __init__(self) -> None:
+        self.player = RenderRecord("player", Rect(0, 0, 0, 0))
+        self.objects: List[RenderRecord] = []
+        self.structure_version = 0
+        self.ui_mode: Mode = "hidden"
+        self.ui_text = ""
+        self.voice_path: Optional[str] = None
+        self.inventory_open = False
+        self.inventory_items: List[Dict[str, str]] = []
+        self.inventory_version = 0
+        # id(записи) -> запись; словарь, чтобы запись попадала сюда один раз
+        self._dirty: Dict[int, RenderRecord] = {}
+
+    def mark_dirty(self, record: RenderRecord) -> None:
+        self._dirty[id(record)] = record
+
+    def take_dirty(self) -> List[RenderRecord]:
+        """Забрать изменившиеся записи. Забирает один потребитель — слои рендера."""
+        if not self._dirty:
+            return []
+        dirty = list(self._dirty.values())
+        self._dirty.clear()
+        return dirty
+
+
 # ==========================
 # Сцена
 # ==========================
@@ -187,7 +333,11 @@ class Scene:
     texture_path_to_player: str = "sprites/bahtiyar"
     l: int = 0
     c: int = 0
-    player_speed: int = 5
+    # Скорость ходьбы (единиц игрового мира в секунду) и анимации (кадров в секунду)
+    walk_speed: float = 120.0
+    walk_anim_fps: float = 6.0
+    # Позиция игрока до последнего тика — для интерполяции при отрисовке
+    prev_player_pos: Optional[Vec2] = None
     # Путь к текстуре игрока:
     player_texture_path: Optional[str] = None
     clickable_objects: Optional[List[ClickableObject]] = None
@@ -203,34 +353,204 @@ class Scene:
     _active_dialog_npc_id: Optional[str] = None
     # Сохранённая позиция игрока для возврата после диалога
     return_pos: Optional[Vec2] = None
+    # Растёт при каждом изменении rect/текстуры/флагов объектов сцены
+    objects_version: int = 0
+    # Сетки для быстрых запросов столкновений и поиска ближайшего интерактивного
+    grid_cell_size: float = 32.0
+    _solid_index: SpatialGrid = field(init=False, repr=False, compare=False)
+    _interactable_index: SpatialGrid = field(init=False, repr=False, compare=False)
+    _object_order: Dict[int, int] = field(init=False, repr=False, compare=False)
+    # Большие сцены вместо сетки держат объекты в массивах NumPy (если он установлен);
+    # на меньших сценах сетка быстрее — накладные расходы NumPy на вызов выше
+    array_store_min_objects: int = 512
+    _arrays: Optional[ObjectArrays] = field(default=None, init=False, repr=False, compare=False)
+    _click_arrays: Optional[ObjectArrays] = field(default=None, init=False, repr=False, compare=False)
+    _click_arrays_src: Optional[list] = field(default=None, init=False, repr=False, compare=False)
+    # Постоянный хитбокс игрока, см. _player_rect
+    _player_box: Rect = field(init=False, repr=False, compare=False)
+    # Состояние для рендера: создаётся при первом render_state() и дальше
+    # обновляется по оповещениям объектов; записи по id(объекта)
+    _render_state: Optional[RenderState] = field(default=None, init=False, repr=False, compare=False)
+    _render_records: Dict[int, RenderRecord] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._player_box = Rect(0, 0, 0, 0)
+        self._rebuild_indexes()
+        for o in self.objects:
+            o._listeners.append(self._on_object_changed)
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Индексы держат id() объектов — после copy/pickle их нужно пересобрать
+        self.__dict__.update(state)
+        self._rebuild_indexes()
+        self._render_state = None
+        self._render_records = {}
+
+    def _rebuild_indexes(self) -> None:
+        self._solid_index = SpatialGrid(self.grid_cell_size)
+        self._interactable_index = SpatialGrid(self.grid_cell_size)
+        self._object_order = {}
+        self._arrays = ObjectArrays(len(self.objects)) if self._wants_arrays(self.objects) else None
+        self._click_arrays = self._click_arrays_src = None
+        for o in self.objects:
+            self._object_order[id(o)] = len(self._object_order)
+            self._index_object(o)
+
+    def _wants_arrays(self, objects: list) -> bool:
+        return HAVE_NUMPY and len(objects) >= self.array_store_min_objects
+
+    def _attach(self, obj: GameObject) -> None:
+        self._object_order[id(obj)] = len(self._object_order)
+        obj._listeners.append(self._on_object_changed)
+        self._index_object(obj)
+
+    def _index_object(self, obj: GameObject) -> None:
+        if self._arrays is not None:
+            self._arrays.add(obj, self._object_order[id(obj)])
+            return
+        r = obj.rect
+        for index, flag in ((self._solid_index, obj.solid), (self._interactable_index, obj.interactable)):
+            if flag:
+                index.insert(obj, r.x1, r.y1, r.x2, r.y2)
+            else:
+                index.remove(obj)
+
+    def _on_object_changed(self, obj: GameObject, field_name: str) -> None:
+        self.objects_version += 1
+        if field_name in ("rect", "solid", "interactable"):
+            self._index_object(obj)
+        record = self._render_records.get(id(obj))
+        if record is not None and field_name != "solid":
+            static, visible = record.static, record.texture_path is not None
+            record.fill(obj)
+            if record.static != static or (record.texture_path is not None) != visible:
+                self._render_state.structure_version += 1
+            self._render_state.mark_dirty(record)
+
+    def object_changed(self, obj: GameObject) -> None:
+        """Сообщить сцене, что rect объекта изменён на месте (без присваивания)."""
+        self._on_object_changed(obj, "rect")
+
+    def add_object(self, obj: GameObject) -> None:
+        self.objects.append(obj)
+        self._attach(obj)
+        if self._arrays is None and self._wants_arrays(self.objects):
+            self._rebuild_indexes()
+        if self._render_state is not None:
+            self._add_render_record(obj)
+        self.objects_version += 1
+
+    def remove_object(self, obj: GameObject) -> None:
+        self.objects.remove(obj)
+        obj._listeners.remove(self._on_object_changed)
+        if self._arrays is not None:
+            self._arrays.remove(obj)
+        self._solid_index.remove(obj)
+        self._interactable_index.remove(obj)
+        record = self._render_records.pop(id(obj), None)
+        if record is not None:
+            self._render_state.objects.remove(record)
+            self._render_state.structure_version += 1
+        self.objects_version += 1
+
+    # ---------- Рендер ----------
+
+    def _add_render_record(self, obj: GameObject) -> None:
+        record = RenderRecord(obj.id, obj.rect)
+        record.fill(obj)
+        self._render_records[id(obj)] = record
+        self._render_state.objects.append(record)
+        self._render_state.structure_version += 1
+
+    def render_state(self, alpha: float = 1.0) -> RenderState:
+        """Состояние для отрисовки кадра; один и тот же объект, обновлённый на месте.
+
+        Записи объектов поддерживаются по оповещениям самих объектов, так что
+        здесь обновляются только игрок и UI: цена кадра не растёт с числом
+        объектов. alpha — как в ``interpolated_player_rect``.
+        """
+        state = self._render_state
+        if state is None:
+            state = self._render_state = RenderState()
+            for o in self.objects:
+                self._add_render_record(o)
+        player = state.player
+        self.interpolated_player_rect(alpha, out=player.rect)
+        player.texture_path = self.player_texture_path
+        player.scale_to_rect = self.scale_player_texture_to_rect
+        player.z = self.player_z
+        tw = self.text_window
+        state.ui_mode, state.ui_text, state.voice_path = tw.mode, tw.text, tw.voice_path
+        inventory = get_inventory_store()
+        state.inventory_open = self.inventory_open
+        state.inventory_items = inventory.items
+        state.inventory_version = inventory.version
+        return state
 
     # ---------- Служебные ----------
 
     def _is_dialog_active(self) -> bool:
         return self._active_dialog_npc_id is not None or self.text_window.mode == "dialog"
 
-    def _player_rect(self, pos: Optional[Vec2] = None) -> Rect:
+    def _player_rect(self, pos: Optional[Vec2] = None, out: Optional[Rect] = None) -> Rect:
+        """Хитбокс игрока.
+
+        Без pos и out возвращается постоянный прямоугольник сцены, обновлённый
+        на месте по player_pos: его нельзя хранить дольше текущего тика.
+        """
         x, y = pos if pos else self.player_pos
         w, h = self.player_size
-        return Rect(x, y, x + w, y + h)
-
-    def _collides_with_solid(self, rect: Rect) -> bool:
-        return any(o.solid and o.rect.intersects(rect) for o in self.objects)
+        if out is None:
+            out = self._player_box if pos is None else Rect(0, 0, 0, 0)
+        return out.set(x, y, x + w, y + h)
+
+    def begin_tick(self) -> None:
+        """Вызывается перед каждым логическим тиком: запоминает состояние для интерполяции."""
+        self.prev_player_pos = self.player_pos
+
+    def interpolated_player_rect(self, alpha: float, out: Optional[Rect] = None) -> Rect:
+        """Хитбокс игрока между прошлым (alpha=0) и текущим (alpha=1) тиком."""
+        if self.prev_player_pos is None or alpha >= 1.0:
+            return self._player_rect(self.player_pos, out)
+        (px, py), (x, y) = self.prev_player_pos, self.player_pos
+        return self._player_rect((px + (x - px) * alpha, py + (y - py) * alpha), out)
+
+    def _collides_with_solid(self, rect: Rect, dx: float = 0.0, dy: float = 0.0) -> bool:
+        """Пересекается ли rect, сдвинутый на (dx, dy), с твёрдым объектом."""
+        if self._arrays is not None:
+            return self._arrays.collides_solid(rect.x1 + dx, rect.y1 + dy, rect.x2 + dx, rect.y2 + dy)
+        candidates = self._solid_index.query(rect.x1 + dx, rect.y1 + dy, rect.x2 + dx, rect.y2 + dy)
+        for o in candidates:
+            if rect.intersects_moved(o.rect, dx, dy):
+                return True
+        return False
 
     def _player_center(self) -> Vec2:
         return self._player_rect().center()
 
     def _nearest_interactable(self) -> Tuple[Optional[GameObject], float]:
-        px, py = self._player_center()
+        """Ближайший интерактивный объект в пределах interact_distance.
+
+        Если такого нет — (None, inf). При равных расстояниях побеждает
+        объект, стоящий раньше в self.objects.
+        """
+        box = self._player_rect()
+        px, py = box.cx, box.cy
+        r = self.interact_distance
+        if self._arrays is not None:
+            return self._arrays.nearest_interactable(px, py, r)
         best_obj = None
         best_dist = float("inf")
-        for obj in self.objects:
-            if not obj.interactable:
-                continue
+        best_order = 0
+        for obj in self._interactable_index.query(px - r, py - r, px + r, py + r):
             d = distance_point_to_rect(px, py, obj.rect)
-            if d < best_dist:
+            if d > r:
+                continue
+            order = self._object_order[id(obj)]
+            if d < best_dist or (d == best_dist and order < best_order):
                 best_dist = d
                 best_obj = obj
+                best_order = order
         return best_obj, best_dist
 
     def _update_hint(self) -> None:
@@ -250,50 +570,67 @@ class Scene:
         if self._is_dialog_active() or self.inventory_open:
             return
 
-        new_rect_x = self._player_rect().moved(dx, 0)
-        if not self._collides_with_solid(new_rect_x):
-            self.player_pos = (self.player_pos[0] + dx, self.player_pos[1])
-
-        new_rect_y = self._player_rect().moved(0, dy)
-        if not self._collides_with_solid(new_rect_y):
-            self.player_pos = (self.player_pos[0], self.player_pos[1] + dy)
+        box = self._player_rect()
+        x, y = self.player_pos
+        if dx and not self._collides_with_solid(box, dx, 0):
+            x += dx
+            box.move_ip(dx, 0)
+        if dy and not self._collides_with_solid(box, 0, dy):
+            y += dy
+        if dx or dy:
+            self.player_pos = (x, y)
 
         self._update_hint()
 
-    def move_forward(self, step: float = 4.0) -> None:
-        if self._is_dialog_active() or self.inventory_open:
-            return
-        self._move(0, -step)
+    def _walk_step(self) -> float:
+        """Смещение за один тик при ходьбе."""
+        return self.walk_speed / TICK_RATE
+
+    @property
+    def player_speed(self) -> int:
+        """Шагов на кадр анимации ходьбы — прежнее поле, теперь выводится из walk_anim_fps."""
+        return max(1, round(TICK_RATE / self.walk_anim_fps))
+
+    @player_speed.setter
+    def player_speed(self, steps: int) -> None:
+        self.walk_anim_fps = TICK_RATE / steps
+
+    def _advance_walk_animation(self) -> None:
+        # кадр анимации сменяется каждые player_speed шагов
         self.l += (self.c % self.player_speed) == 0
         self.l %= 5
         self.c += 1
+
+    def move_forward(self, step: Optional[float] = None) -> None:
+        if self._is_dialog_active() or self.inventory_open:
+            return
+        step = self._walk_step() if step is None else step
+        self._move(0, -step)
+        self._advance_walk_animation()
         self.player_texture_path = self.texture_path_to_player + f'/up{self.l % 5}.png'
 
-    def move_back(self, step: float = 4.0) -> None:
+    def move_back(self, step: Optional[float] = None) -> None:
         if self._is_dialog_active() or self.inventory_open:
             return
+        step = self._walk_step() if step is None else step
         self._move(0, step)
-        self.l += (self.c % self.player_speed) == 0
-        self.l %= 5
-        self.c += 1
+        self._advance_walk_animation()
         self.player_texture_path = self.texture_path_to_player + f'/down{self.l}.png'
 
-    def move_left(self, step: float = 4.0) -> None:
+    def move_left(self, step: Optional[float] = None) -> None:
         if self._is_dialog_active() or self.inventory_open:
             return
+        step = self._walk_step() if step is None else step
         self._move(-step, 0)
-        self.l += (self.c % self.player_speed) == 0
-        self.l %= 5
-        self.c += 1
+        self._advance_walk_animation()
         self.player_texture_path = self.texture_path_to_player + f'/left{self.l}.png'
 
-    def move_right(self,step: float = 4.0) -> None:
+    def move_right(self, step: Optional[float] = None) -> None:
         if self._is_dialog_active() or self.inventory_open:
             return
+        step = self._walk_step() if step is None else step
         self._move(step, 0)
-        self.l += (self.c % self.player_speed) == 0
-        self.l %= 5
-        self.c += 1
+        self._advance_walk_animation()
         self.player_texture_path = self.texture_path_to_player + f'/right{self.l}.png'
 
     # ---------- Диалоги ----------
@@ -307,6 +644,7 @@ class Scene:
         line = npc.next_dialog_line()
         if line is not None:
             self.text_window.show_dialog(line, npc.id)
+            prefetch_voice(dialog_line_voice(npc.peek_dialog_line()))
         else:
             self._active_dialog_npc_id = None
             self.text_window.hide()
@@ -322,6 +660,7 @@ class Scene:
         line = npc.next_dialog_line()
         if line is not None:
             self.text_window.show_dialog(line, npc.id)
+            prefetch_voice(dialog_line_voice(npc.peek_dialog_line()))
             return None
         npc.on_dialog_finished(self)
         self._active_dialog_npc_id = None
@@ -329,6 +668,16 @@ class Scene:
         next_scene = npc.on_interact(self)
         return next_scene
 
+    def prefetch_voices(self) -> None:
+        """Заранее декодировать озвучку, которая может понадобиться первой:
+        слова кликабельных объектов и первые реплики NPC."""
+        for obj in self.clickable_objects or []:
+            prefetch_voice(obj.voice_path)
+        for obj in self.objects:
+            if isinstance(obj, NPC) and obj.interactable and obj.has_dialog():
+                line = obj.peek_dialog_line() if not obj.is_dialog_finished() else obj.dialog_lines[0]
+                prefetch_voice(dialog_line_voice(line))
+
     # ---------- Взаимодействие (E) ----------
 
     def unteract(self) -> Optional["Scene"]:
@@ -358,6 +707,8 @@ class Scene:
                     next_scene.return_pos = self.return_pos
                 else:
                     next_scene.return_pos = self.player_pos
+            # игрок перенесён — интерполировать от прежней позиции нельзя
+            next_scene.prev_player_pos = None
         return next_scene
 
     # ---------- Инвентарь ----------
@@ -368,8 +719,7 @@ class Scene:
 
         def _add_one(item: Tuple[str, str]) -> None:
             word, path = item
-            inventory = load_inventory()
-            if word not in [it["word"] for it in inventory]:
+            if not get_inventory_store().has(word):
                 add_inventory_item(word, path)
 
         # Если нам передали список пар — пробегаемся, иначе считаем, что передана одна пара
@@ -400,26 +750,47 @@ class Scene:
     def process_click(self, x: int, y: int) -> tuple[Optional[str], Optional[str]]:
         if not self.clickable_objects:
             return None, None
-        for obj in self.clickable_objects:
-            if obj.rect.x1 <= x <= obj.rect.x2:
-                if obj.rect.y1 <= y <= obj.rect.y2:
-                    self.add_element((obj.translation, obj.inventory_texture_path))
-                    self.clickable_objects.remove(obj)
-                    return obj.translation, obj.voice_path
-        return None, None
+        obj = self._clickable_at(x, y)
+        if obj is None:
+            return None, None
+        self.add_element((obj.translation, obj.inventory_texture_path))
+        self.clickable_objects.remove(obj)
+        if self._click_arrays is not None and self._click_arrays_src is self.clickable_objects:
+            self._click_arrays.remove(obj)
+        return obj.translation, obj.voice_path
+
+    def _clickable_at(self, x: float, y: float) -> Optional[ClickableObject]:
+        """Первый кликабельный объект, в который попадает точка (границы включительно)."""
+        objs = self.clickable_objects
+        if self._wants_arrays(objs):
+            # массивы пересобираются, если список подменили или изменили в обход process_click
+            store = self._click_arrays
+            if store is None or self._click_arrays_src is not objs or len(store) != len(objs):
+                store = ObjectArrays(len(objs))
+                for i, o in enumerate(objs):
+                    store.add(o, i)
+                self._click_arrays, self._click_arrays_src = store, objs
+            return store.hit(x, y)
+        for obj in objs:
+            if obj.rect.x1 <= x <= obj.rect.x2 and obj.rect.y1 <= y <= obj.rect.y2:
+                return obj
+        return None
 
     # ---------- Данные для рендера (включая пути к текстурам) ----------
 
     def get_draw_data(self) -> dict:
         """
-        Возвращает структуру для рендера:
+        Полный снимок сцены в виде словарей (для отладки и внешних инструментов;
+        сам рендер пользуется render_state — он не пересобирается каждый кадр):
         - player: rect, texture_path, z
         - objects: список словарей с rect, texture_path, z и пр.
         - ui: состояние текстового окна
+        - inventory: предметы из памяти (без чтения диска) и версия инвентаря
         """
+        inventory = get_inventory_store()
         return {
             "player": {
-                "rect": self._player_rect(),
+                "rect": self._player_rect(self.player_pos),  # новый Rect: _player_box меняется при ходьбе
                 "texture_path": self.player_texture_path,
                 "scale_to_rect": self.scale_player_texture_to_rect,
                 "z": self.player_z,
@@ -449,7 +820,8 @@ class Scene:
             },
             "inventory": {
                 "open": self.inventory_open,
-                "items": load_inventory(),
+                "items": inventory.items,
+                "version": inventory.version,
             },
         }
 
@@ -0,0 +1,453 @@
+"""Compile the scene files in ``scene_data/`` into one cached bundle.
+
+Every scene is a JSON file named after the scene id. Shared pieces live in
+``templates.json``, which has two sections:
+
+- ``objects``: named object templates. A template may ``extends`` another
+  template and override some of its fields. Its id defaults to the template
+  name.
+- ``scenes``: abstract scene templates. Scene files and scene templates can
+  ``extends`` a scene template or another scene.
+
+A scene has the ``Scene`` fields listed in ``SCENE_FIELDS`` plus these keys:
+
+- ``objects`` and ``clickables``: lists that replace the inherited ones.
+  An entry is one of:
+  - a template name;
+  - ``{"use": name, ...}``, a template with some fields changed;
+  - ``{"wall_of": id}``, the solid wall of a house, computed from that
+    object's final rect;
+  - an inline object with a ``type``: ``static``, ``npc`` or ``clickable``.
+- ``override``: ``{id: {field: value}}``, changes to inherited objects.
+  Overrides are merged field by field along the ``extends`` chain.
+- ``remove``: ids of inherited objects to drop.
+- ``start_dialog``: id of the NPC whose dialog opens with the scene.
+- ``description``: free text.
+
+Object fields are the constructor arguments of the object classes, with
+``next_scene`` (a scene id) in place of ``next_scene_factory``.
+
+The compiler resolves all of this and checks the result. It rejects:
+- unknown keys and values of the wrong type;
+- dangling references and duplicate ids;
+- asset files that do not exist.
+
+It writes the resolved scenes, without default values, to
+``scene_data/scenes.bundle`` as compact JSON. ``load_bundle`` reads that file
+in one go and rebuilds it only when a source file, this compiler or one of
+the left-out defaults has changed::
+
+    python scene_compiler.py          # compile and write the bundle
+    python scene_compiler.py --check  # only validate
+"""
+import argparse
+import dataclasses
+import hashlib
+import json
+import math
+import os
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+from scene import NPC, ClickableObject, Scene, StaticObject
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(ROOT, "scene_data")
+TEMPLATES_FILE = "templates.json"
+BUNDLE_PATH = os.path.join(SOURCE_DIR, "scenes.bundle")
+BUNDLE_FORMAT = 1
+
+OBJECT_TYPES = {"static": StaticObject, "npc": NPC, "clickable": ClickableObject}
+
+# The wall of a house sprite: its rect minus the sides, the roof and the porch.
+WALL_INSET = (17, 62, 17, 35)  # left, top, right, bottom
+
+Source = Dict[str, Any]
+
+
+class SceneDataError(ValueError):
+    """A scene file is invalid. The message names the file and the object."""
+
+
+# ---------- field checks ----------
+
+def _is_number(v: Any) -> bool:
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+def _is_optional_str(v: Any) -> bool:
+    return v is None or isinstance(v, str)
+
+
+def _is_vec2(v: Any) -> bool:
+    return isinstance(v, list) and len(v) == 2 and all(_is_number(x) for x in v)
+
+
+def _is_box(v: Any) -> bool:
+    return isinstance(v, list) and len(v) == 4 and all(_is_number(x) and math.isfinite(x) for x in v)
+
+
+def _is_rect(v: Any) -> bool:
+    return _is_box(v) and v[0] < v[2] and v[1] < v[3]
+
+
+def _is_dialog(v: Any) -> bool:
+    return isinstance(v, list) and all(
+        isinstance(line, str)
+        or isinstance(line, dict) and isinstance(line.get("text"), str) and set(line) <= {"text", "voice"}
+        and _is_optional_str(line.get("voice"))
+        for line in v)
+
+
+def _is_reward(v: Any) -> bool:
+    return v is None or isinstance(v, list) and all(
+        isinstance(p, list) and len(p) == 2 and all(isinstance(s, str) for s in p) for p in v)
+
+
+_COMMON_FIELDS = {
+    "id": lambda v: isinstance(v, str) and v != "",
+    "rect": _is_rect,
+    "solid": lambda v: isinstance(v, bool),
+    "interactable": lambda v: isinstance(v, bool),
+    "next_scene": _is_optional_str,
+    "name": _is_optional_str,
+    "texture_path": _is_optional_str,
+    "z": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "scale_texture_to_rect": lambda v: isinstance(v, bool),
+}
+OBJECT_FIELDS = {
+    "static": _COMMON_FIELDS,
+    "npc": dict(_COMMON_FIELDS, dialog_lines=_is_dialog, repeatable=lambda v: isinstance(v, bool),
+                persist_progress=lambda v: isinstance(v, bool), reward=_is_reward),
+    "clickable": dict(_COMMON_FIELDS, inventory_texture_path=_is_optional_str, translation=_is_optional_str,
+                      voice_path=_is_optional_str),
+}
+SCENE_FIELDS = {
+    "player_pos": _is_vec2,
+    "player_size": _is_vec2,
+    "interact_distance": _is_number,
+    "texture_path_to_player": lambda v: isinstance(v, str),
+    "walk_speed": _is_number,
+    "walk_anim_fps": _is_number,
+    "player_texture_path": _is_optional_str,
+    "scale_player_texture_to_rect": lambda v: isinstance(v, bool),
+    "player_z": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "grid_cell_size": _is_number,
+    "array_store_min_objects": lambda v: isinstance(v, int) and not isinstance(v, bool),
+}
+_SCENE_KEYS = set(SCENE_FIELDS) | {"extends", "description", "objects", "clickables", "override", "remove",
+                                   "start_dialog"}
+_ASSET_FIELDS = ("texture_path", "inventory_texture_path", "voice_path")
+
+
+def _defaults(cls: type) -> Dict[str, Any]:
+    """Constructor defaults of a dataclass, so the bundle can leave them out."""
+    out = {}
+    for f in dataclasses.fields(cls):
+        if f.default is not dataclasses.MISSING:
+            out[f.name] = f.default
+        elif f.default_factory is not dataclasses.MISSING:
+            out[f.name] = f.default_factory()
+    out["next_scene"] = None
+    return out
+
+
+_OBJECT_DEFAULTS = {kind: _defaults(cls) for kind, cls in OBJECT_TYPES.items()}
+_SCENE_DEFAULTS = _defaults(Scene)
+
+
+def code_version() -> str:
+    """Hash of this compiler and of the defaults that the bundle leaves out.
+
+    A bundle written before either changed would silently pick up the new
+    defaults for the omitted fields, so it counts as stale.
+    """
+    digest = hashlib.sha256()
+    with open(os.path.abspath(__file__), "rb") as f:
+        digest.update(f.read())
+    defaults = {
+        "scene": {name: _SCENE_DEFAULTS.get(name) for name in SCENE_FIELDS},
+        "objects": {kind: {name: _OBJECT_DEFAULTS[kind].get(name) for name in fields}
+                    for kind, fields in OBJECT_FIELDS.items()},
+    }
+    digest.update(json.dumps(defaults, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+# ---------- sources ----------
+
+def _read_json(path: str) -> Any:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except ValueError as e:
+        raise SceneDataError(f"{os.path.basename(path)}: {e}") from None
+
+
+def source_files(source_dir: str = SOURCE_DIR) -> List[str]:
+    return sorted(name for name in os.listdir(source_dir) if name.endswith(".json"))
+
+
+def source_stats(source_dir: str = SOURCE_DIR) -> Dict[str, List[int]]:
+    """(mtime_ns, size) of every source file; the bundle is stale when these change."""
+    stats = {}
+    for name in source_files(source_dir):
+        st = os.stat(os.path.join(source_dir, name))
+        stats[name] = [st.st_mtime_ns, st.st_size]
+    return stats
+
+
+class _Compiler:
+    def __init__(self, source_dir: str):
+        self.source_dir = source_dir
+        templates: Source = {}
+        if os.path.exists(os.path.join(source_dir, TEMPLATES_FILE)):
+            templates = _read_json(os.path.join(source_dir, TEMPLATES_FILE))
+        unknown = set(templates) - {"objects", "scenes"}
+        if unknown:
+            raise SceneDataError(f"{TEMPLATES_FILE}: unknown sections {sorted(unknown)}")
+        self.object_templates: Dict[str, Source] = templates.get("objects", {})
+        self.scene_templates: Dict[str, Source] = templates.get("scenes", {})
+        self.scene_files: Dict[str, Source] = {
+            name[:-len(".json")]: _read_json(os.path.join(source_dir, name))
+            for name in source_files(source_dir) if name != TEMPLATES_FILE
+        }
+        clash = set(self.scene_files) & set(self.scene_templates)
+        if clash:
+            raise SceneDataError(f"{TEMPLATES_FILE}: scene templates shadow scene files {sorted(clash)}")
+        self._objects: Dict[str, Source] = {}
+        self._scenes: Dict[str, Source] = {}
+
+    # ----- inheritance -----
+
+    def object_template(self, name: str, where: str, chain: Tuple[str, ...] = ()) -> Source:
+        if name in chain:
+            raise SceneDataError(f"{where}: object templates extend each other: {' -> '.join(chain + (name,))}")
+        if name not in self._objects:
+            raw = self.object_templates.get(name)
+            if not isinstance(raw, dict):
+                raise SceneDataError(f"{where}: unknown object template {name!r}")
+            base: Source = {"id": name}
+            if "extends" in raw:
+                base = dict(self.object_template(raw["extends"], f"{TEMPLATES_FILE}: object {name!r}",
+                                                 chain + (name,)))
+                base.setdefault("id", name)
+            self._objects[name] = {**base, **{k: v for k, v in raw.items() if k != "extends"}}
+        return self._objects[name]
+
+    def scene_source(self, name: str, where: str, chain: Tuple[str, ...] = ()) -> Source:
+        if name in chain:
+            raise SceneDataError(f"{where}: scenes extend each other: {' -> '.join(chain + (name,))}")
+        if name not in self._scenes:
+            if name in self.scene_files:
+                raw, origin = self.scene_files[name], f"{name}.json"
+            elif name in self.scene_templates:
+                raw, origin = self.scene_templates[name], f"{TEMPLATES_FILE}: scene {name!r}"
+            else:
+                raise SceneDataError(f"{where}: unknown scene {name!r}")
+            if not isinstance(raw, dict):
+                raise SceneDataError(f"{origin}: a scene must be an object")
+            unknown = set(raw) - _SCENE_KEYS
+            if unknown:
+                raise SceneDataError(f"{origin}: unknown keys {sorted(unknown)}")
+            source: Source = {"override": {}, "remove": [], "origin": origin}
+            if "extends" in raw:
+                base = self.scene_source(raw["extends"], origin, chain + (name,))
+                source = dict(base, override=dict(base["override"]), remove=list(base["remove"]), origin=origin)
+            for key, value in raw.items():
+                if key == "override":
+                    if not isinstance(value, dict) or not all(isinstance(v, dict) for v in value.values()):
+                        raise SceneDataError(f"{origin}: override must map ids to fields")
+                    for oid, fields in value.items():
+                        source["override"][oid] = {**source["override"].get(oid, {}), **fields}
+                elif key == "remove":
+                    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+                        raise SceneDataError(f"{origin}: remove must be a list of ids")
+                    source["remove"] = source["remove"] + value
+                elif key != "extends":
+                    source[key] = value
+            self._scenes[name] = source
+        return self._scenes[name]
+
+    # ----- scenes -----
+
+    def expand(self, entry: Any, where: str) -> Source:
+        if isinstance(entry, str):
+            return dict(self.object_template(entry, where))
+        if not isinstance(entry, dict):
+            raise SceneDataError(f"{where}: bad object entry {entry!r}")
+        if "wall_of" in entry:
+            if set(entry) != {"wall_of"}:
+                raise SceneDataError(f"{where}: wall_of takes no other fields")
+            return dict(entry)
+        if "use" in entry:
+            base = self.object_template(entry["use"], where)
+            return {**base, **{k: v for k, v in entry.items() if k != "use"}}
+        return {"type": "static", **entry}
+
+    def scene(self, scene_id: str) -> Source:
+        source = self.scene_source(scene_id, f"{scene_id}.json")
+        origin = source["origin"]
+        groups = {}
+        for key in ("objects", "clickables"):
+            entries = source.get(key, [])
+            if not isinstance(entries, list):
+                raise SceneDataError(f"{origin}: {key} must be a list")
+            groups[key] = [self.expand(e, f"{origin}: {key}") for e in entries]
+
+        ids = {o.get("id") for objs in groups.values() for o in objs if "wall_of" not in o}
+        for oid in list(source["override"]) + source["remove"]:
+            if oid not in ids:
+                raise SceneDataError(f"{origin}: override/remove of unknown object {oid!r}")
+        for key, objs in groups.items():
+            objs = [o for o in objs if o.get("id") not in source["remove"] or "wall_of" in o]
+            objs = [{**o, **source["override"].get(o.get("id"), {})} for o in objs]
+            groups[key] = objs
+
+        by_id = {o.get("id"): o for o in groups["objects"] if "wall_of" not in o}
+        walls = []
+        for i, o in enumerate(groups["objects"]):
+            if "wall_of" in o:
+                groups["objects"][i] = self.wall(o["wall_of"], by_id, origin)
+                walls.append(groups["objects"][i])
+
+        out: Source = {}
+        for field_name, check in SCENE_FIELDS.items():
+            if field_name in source:
+                value = source[field_name]
+                if not check(value):
+                    raise SceneDataError(f"{origin}: bad {field_name}: {value!r}")
+                if value != _SCENE_DEFAULTS.get(field_name):
+                    out[field_name] = value
+        seen = set()
+        for key in ("objects", "clickables"):
+            objs = []
+            for obj in groups[key]:
+                self.check_object(obj, origin, generated=any(obj is w for w in walls))
+                if obj["id"] in seen:
+                    raise SceneDataError(f"{origin}: duplicate object id {obj['id']!r}")
+                seen.add(obj["id"])
+                if key == "clickables" and obj["type"] != "clickable":
+                    raise SceneDataError(f"{origin}: clickables entry {obj['id']!r} is a {obj['type']}")
+                objs.append(self.compact(obj))
+            out[key] = objs
+        start = source.get("start_dialog")
+        if start is not None:
+            if not any(o["id"] == start and o["type"] == "npc" for o in groups["objects"]):
+                raise SceneDataError(f"{origin}: start_dialog {start!r} is not an NPC of the scene")
+            out["start_dialog"] = start
+        return out
+
+    @staticmethod
+    def wall(house_id: str, by_id: Dict[str, Source], origin: str) -> Source:
+        """What make_wall used to build at runtime: a solid box under the house."""
+        house = by_id.get(house_id)
+        if house is None:
+            raise SceneDataError(f"{origin}: wall_of unknown object {house_id!r}")
+        if not _is_rect(house.get("rect")):
+            raise SceneDataError(f"{origin}: wall_of {house_id!r}, which has no valid rect")
+        x1, y1, x2, y2 = house["rect"]
+        left, top, right, bottom = WALL_INSET
+        return {"type": "static", "id": "wall_" + house_id, "rect": [x1 + left, y1 + top, x2 - right, y2 - bottom],
+                "solid": True, "z": -1}
+
+    def check_object(self, obj: Source, origin: str, generated: bool = False) -> None:
+        """Validate a resolved object. ``generated`` marks walls built by ``wall``.
+
+        A small house gives its wall an inverted rect, as make_wall did. Such a
+        wall collides with nothing, so generated walls only need finite coordinates.
+        """
+        where = f"{origin}: object {obj.get('id')!r}"
+        kind = obj.get("type")
+        if kind not in OBJECT_FIELDS:
+            raise SceneDataError(f"{where}: unknown type {kind!r}")
+        fields = OBJECT_FIELDS[kind]
+        unknown = set(obj) - set(fields) - {"type"}
+        if unknown:
+            raise SceneDataError(f"{where}: unknown fields {sorted(unknown)} for {kind}")
+        if "rect" not in obj:
+            raise SceneDataError(f"{where}: rect is required")
+        for name, value in obj.items():
+            check = _is_box if generated and name == "rect" else fields.get(name)
+            if name != "type" and not check(value):
+                raise SceneDataError(f"{where}: bad {name}: {value!r}")
+        target = obj.get("next_scene")
+        if target is not None and target not in self.scene_files:
+            raise SceneDataError(f"{where}: next_scene {target!r} is not a scene")
+        for path in self.asset_paths(obj):
+            if not os.path.exists(os.path.join(ROOT, path)):
+                raise SceneDataError(f"{where}: missing file {path}")
+
+    @staticmethod
+    def asset_paths(obj: Source) -> List[str]:
+        paths = [obj[f] for f in _ASSET_FIELDS if obj.get(f)]
+        paths += [line["voice"] for line in obj.get("dialog_lines", ()) if isinstance(line, dict) and line.get("voice")]
+        paths += [path for _, path in obj.get("reward") or ()]
+        return paths
+
+    @staticmethod
+    def compact(obj: Source) -> Source:
+        defaults = _OBJECT_DEFAULTS[obj["type"]]
+        return {k: v for k, v in obj.items() if k in ("type", "id", "rect") or v != defaults.get(k)}
+
+
+def compile_scenes(source_dir: str = SOURCE_DIR) -> Dict[str, Any]:
+    """Resolve and validate every scene file. Raises ``SceneDataError``."""
+    compiler = _Compiler(source_dir)
+    scenes = {scene_id: compiler.scene(scene_id) for scene_id in compiler.scene_files}
+    return {"format": BUNDLE_FORMAT, "code": code_version(), "sources": source_stats(source_dir),
+            "scenes": scenes}
+
+
+def write_bundle(bundle: Dict[str, Any], path: str = BUNDLE_PATH) -> int:
+    """Write the bundle atomically. Returns its size in bytes."""
+    data = json.dumps(bundle, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return len(data)
+
+
+def load_bundle(path: str = BUNDLE_PATH, source_dir: str = SOURCE_DIR) -> Dict[str, Source]:
+    """Compiled scenes by id. The bundle is recompiled first if it is missing or stale."""
+    try:
+        with open(path, "rb") as f:
+            bundle = json.loads(f.read())
+        if (bundle.get("format") == BUNDLE_FORMAT and bundle.get("code") == code_version()
+                and bundle.get("sources") == source_stats(source_dir)):
+            return bundle["scenes"]
+    except (OSError, ValueError):
+        pass
+    bundle = compile_scenes(source_dir)
+    try:
+        write_bundle(bundle, path)
+    except OSError as e:
+        print("scene bundle not written:", e)
+    return bundle["scenes"]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compile scene_data/*.json into the scene bundle.")
+    parser.add_argument("--dir", default=SOURCE_DIR, help="scene source directory")
+    parser.add_argument("--output", default=None, help="bundle path (default: <dir>/scenes.bundle)")
+    parser.add_argument("--check", action="store_true", help="validate only, do not write the bundle")
+    args = parser.parse_args(argv)
+    try:
+        bundle = compile_scenes(args.dir)
+    except SceneDataError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    scenes = bundle["scenes"]
+    objects = sum(len(s["objects"]) + len(s["clickables"]) for s in scenes.values())
+    if args.check:
+        print(f"{len(scenes)} scenes, {objects} objects: ok")
+        return 0
+    output = args.output or os.path.join(args.dir, "scenes.bundle")
+    size = write_bundle(bundle, output)
+    print(f"{len(scenes)} scenes, {objects} objects -> {output} ({size} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""Lazy mapping from scene id to scene instance.
+
+Scenes are built by their factory on first lookup only. What happens on
+later lookups is controlled by the policy:
+
+- ``"fresh"``  — call the factory every time;
+- ``"cached"`` — build once and keep returning the same instance;
+- ``"reset"``  — build once, keep the pristine instance as a template and
+  return a deep copy of it, so each lookup gets initial state without
+  re-running the factory.
+
+The template is never handed out, so changes to a ``"cached"`` instance
+do not leak into later ``"reset"`` lookups.
+"""
+import copy
+from typing import Dict, Iterator, List, Literal, Mapping, Optional
+
+from scene import Scene, SceneFactory
+
+CachePolicy = Literal["fresh", "cached", "reset"]
+
+
+class SceneRegistry(Mapping[str, Scene]):
+    def __init__(self, factories: Optional[Dict[str, SceneFactory]] = None, policy: CachePolicy = "cached"):
+        self.policy: CachePolicy = policy
+        self._factories: Dict[str, SceneFactory] = dict(factories or {})
+        self._live: Dict[str, Scene] = {}
+        self._templates: Dict[str, Scene] = {}
+
+    def register(self, scene_id: str, factory: SceneFactory) -> None:
+        self._factories[scene_id] = factory
+        self.reset(scene_id)
+
+    def ids(self) -> List[str]:
+        """Ids of all registered scenes; nothing gets instantiated."""
+        return list(self._factories)
+
+    def factory(self, scene_id: str) -> SceneFactory:
+        return self._factories[scene_id]
+
+    def get_scene(self, scene_id: str, policy: Optional[CachePolicy] = None) -> Scene:
+        policy = policy or self.policy
+        factory = self._factories[scene_id]
+        if policy == "fresh":
+            return factory()
+        if policy == "reset":
+            template = self._templates.get(scene_id)
+            if template is None:
+                template = self._templates[scene_id] = factory()
+            return copy.deepcopy(template)
+        scene = self._live.get(scene_id)
+        if scene is None:
+            scene = self._live[scene_id] = factory()
+        return scene
+
+    def is_built(self, scene_id: str) -> bool:
+        return scene_id in self._live or scene_id in self._templates
+
+    def reset(self, scene_id: Optional[str] = None) -> None:
+        """Forget cached instances and templates (all of them, or just ``scene_id``)."""
+        if scene_id is None:
+            self._live.clear()
+            self._templates.clear()
+        else:
+            self._live.pop(scene_id, None)
+            self._templates.pop(scene_id, None)
+
+    def __getitem__(self, scene_id: str) -> Scene:
+        return self.get_scene(scene_id)
+
+    def __contains__(self, scene_id: object) -> bool:
+        return scene_id in self._factories
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._factories)
+
+    def __len__(self) -> int:
+        return len(self._factories)
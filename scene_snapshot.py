@@ -0,0 +1,411 @@
+"""Versioned snapshots of the full scene state.
+
+A snapshot holds everything that changes while playing a scene. That covers
+the player position and animation frame, ``return_pos``, the text window and
+the open dialog. For every object it covers the rect, flags, texture and z,
+plus NPC dialog progress and pending rewards. It also lists the clickable
+objects that have not been collected yet, and the inventory. Content that
+never changes comes from a pristine template of the same scene, such as
+``next_scene_factory`` callbacks and dialog lines. ``restore`` applies a
+snapshot to such a template directly; the player's actions are not replayed.
+
+The binary encoding is a 14-byte header (magic, format version, CRC32 of
+the payload, string count) followed by a string table and fixed-size
+``struct`` records that refer to the strings by index. ``decode`` rejects
+data whose checksum or coordinates do not make sense. ``to_json`` gives a
+readable export for debugging::
+
+    python scene_snapshot.py save.bin
+"""
+import argparse
+import dataclasses
+import json
+import math
+import struct
+import sys
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import data_helper
+from scene import NPC, ClickableObject, GameObject, Rect, Scene, StaticObject, TextWindow
+
+MAGIC = b"TSAV"
+SNAPSHOT_VERSION = 2
+
+# magic, format version, CRC32 of everything after the header, number of strings
+_HEADER = struct.Struct("<4sHII")
+# player x, y; return x, y (NaN = None); l, c; flags; 7 string refs; object, clickable and inventory counts
+_SCENE = struct.Struct("<4d2iB7I3I")
+# kind; rect; z; flags; id, name, texture, translation, inventory texture, voice; dialog index; reward count
+_OBJECT = struct.Struct("<B4diB6IiI")
+_PAIR = struct.Struct("<2I")
+
+_NONE = 0  # string ref of None; other refs are index + 1
+_NO_REWARD = 0xFFFFFFFF
+_MODES = ("hidden", "hint", "dialog")
+# object kinds by code; the code is the index
+_KINDS = (StaticObject, NPC, ClickableObject, GameObject)
+_KIND_NAMES = ("static", "npc", "clickable", "object")
+# Coordinates are far below this in every scene; anything larger is damage.
+COORD_LIMIT = 1e6
+
+Pair = Tuple[str, str]
+
+
+class SnapshotError(ValueError):
+    """The data is not a snapshot this version can read."""
+
+
+@dataclass
+class ObjectState:
+    id: str
+    kind: str
+    rect: Tuple[float, float, float, float]
+    z: int = 0
+    solid: bool = False
+    interactable: bool = False
+    scale_texture_to_rect: bool = True
+    name: Optional[str] = None
+    texture_path: Optional[str] = None
+    # NPC
+    dialog_index: int = 0
+    reward: Optional[List[Pair]] = None
+    # ClickableObject
+    translation: Optional[str] = None
+    inventory_texture_path: Optional[str] = None
+    voice_path: Optional[str] = None
+
+
+@dataclass
+class SceneSnapshot:
+    scene_id: str
+    player_pos: Tuple[float, float]
+    return_pos: Optional[Tuple[float, float]] = None
+    player_texture_path: Optional[str] = None
+    l: int = 0
+    c: int = 0
+    inventory_open: bool = False
+    active_dialog_npc_id: Optional[str] = None
+    text_mode: str = "hidden"
+    text: str = ""
+    text_source_id: Optional[str] = None
+    text_voice_path: Optional[str] = None
+    objects: List[ObjectState] = field(default_factory=list)
+    clickables: List[ObjectState] = field(default_factory=list)
+    inventory: List[Dict[str, str]] = field(default_factory=list)
+
+
+# ---------- capture / restore ----------
+
+def _kind(obj: GameObject) -> str:
+    for kind, cls in zip(_KIND_NAMES, _KINDS):
+        if type(obj) is cls:
+            return kind
+    for kind, cls in zip(_KIND_NAMES, _KINDS):
+        if isinstance(obj, cls):
+            return kind
+    raise TypeError(f"cannot snapshot {type(obj).__name__}")
+
+
+def _rewards(reward) -> Optional[List[Pair]]:
+    if not reward:
+        return None
+    pairs = reward if isinstance(reward, list) else [reward]
+    return [(word, path) for word, path in pairs]
+
+
+def _object_state(obj: GameObject) -> ObjectState:
+    r = obj.rect
+    state = ObjectState(obj.id, _kind(obj), (r.x1, r.y1, r.x2, r.y2), obj.z, obj.solid, obj.interactable,
+                        obj.scale_texture_to_rect, obj.name, obj.texture_path)
+    if isinstance(obj, NPC):
+        state.dialog_index = obj._dialog_index
+        state.reward = _rewards(obj.reward)
+    if isinstance(obj, ClickableObject):
+        state.translation = obj.translation
+        state.inventory_texture_path = obj.inventory_texture_path
+        state.voice_path = obj.voice_path
+    return state
+
+
+def capture(scene: Scene) -> SceneSnapshot:
+    """Snapshot of ``scene`` and the current inventory."""
+    tw = scene.text_window
+    return SceneSnapshot(
+        scene_id=scene.id,
+        player_pos=tuple(scene.player_pos),
+        return_pos=tuple(scene.return_pos) if scene.return_pos is not None else None,
+        player_texture_path=scene.player_texture_path,
+        l=scene.l,
+        c=scene.c,
+        inventory_open=scene.inventory_open,
+        active_dialog_npc_id=scene._active_dialog_npc_id,
+        text_mode=tw.mode,
+        text=tw.text,
+        text_source_id=tw.source_object_id,
+        text_voice_path=tw.voice_path,
+        objects=[_object_state(o) for o in scene.objects],
+        clickables=[_object_state(o) for o in scene.clickable_objects or ()],
+        inventory=data_helper.get_inventory_store().to_list(),
+    )
+
+
+def _by_id(objects) -> Dict[str, List[GameObject]]:
+    known: Dict[str, List[GameObject]] = {}
+    for o in objects or ():
+        known.setdefault(o.id, []).append(o)
+    return known
+
+
+def _restore_object(state: ObjectState, known: Dict[str, List[GameObject]]) -> GameObject:
+    # ids are not guaranteed unique: objects with the same id are matched in order
+    same_id = known.get(state.id)
+    obj = same_id.pop(0) if same_id else None
+    if obj is None or _kind(obj) != state.kind:
+        # not in the template (e.g. added while playing): rebuilt without content such as dialog lines
+        obj = _KINDS[_KIND_NAMES.index(state.kind)](id=state.id, rect=Rect(*state.rect))
+    # the template scene is discarded; the restored scene attaches its own listener
+    obj._listeners.clear()
+    obj.rect = Rect(*state.rect)
+    obj.z = state.z
+    obj.solid = state.solid
+    obj.interactable = state.interactable
+    obj.scale_texture_to_rect = state.scale_texture_to_rect
+    obj.name = state.name
+    obj.texture_path = state.texture_path
+    if isinstance(obj, NPC):
+        obj._dialog_index = state.dialog_index
+        obj.reward = list(state.reward) if state.reward else None
+    if isinstance(obj, ClickableObject):
+        obj.translation = state.translation
+        obj.inventory_texture_path = state.inventory_texture_path
+        obj.voice_path = state.voice_path
+    return obj
+
+
+def restore(snapshot: SceneSnapshot, template: Scene) -> Scene:
+    """Build the snapshotted scene from ``template``, a pristine scene with the same id.
+
+    The template's objects are reused (and modified), so pass a copy, e.g.
+    ``scenes.get_scene(scene_id, "reset")``. The inventory is not touched,
+    see ``resume``.
+    """
+    if template.id != snapshot.scene_id:
+        raise SnapshotError(f"snapshot of {snapshot.scene_id!r} applied to {template.id!r}")
+    known, known_clickables = _by_id(template.objects), _by_id(template.clickable_objects)
+    text_window = TextWindow(snapshot.text_mode, snapshot.text, snapshot.text_source_id, snapshot.text_voice_path)
+    return dataclasses.replace(
+        template,
+        objects=[_restore_object(s, known) for s in snapshot.objects],
+        clickable_objects=[_restore_object(s, known_clickables) for s in snapshot.clickables],
+        player_pos=tuple(snapshot.player_pos),
+        return_pos=tuple(snapshot.return_pos) if snapshot.return_pos is not None else None,
+        prev_player_pos=None,
+        player_texture_path=snapshot.player_texture_path,
+        l=snapshot.l,
+        c=snapshot.c,
+        inventory_open=snapshot.inventory_open,
+        _active_dialog_npc_id=snapshot.active_dialog_npc_id,
+        text_window=text_window,
+    )
+
+
+# ---------- binary encoding ----------
+
+class _Strings:
+    def __init__(self) -> None:
+        self.index: Dict[str, int] = {}
+
+    def ref(self, s: Optional[str]) -> int:
+        if s is None:
+            return _NONE
+        i = self.index.get(s)
+        if i is None:
+            i = self.index[s] = len(self.index)
+        return i + 1
+
+
+def encode(snapshot: SceneSnapshot) -> bytes:
+    strings = _Strings()
+    ref = strings.ref
+    ret = snapshot.return_pos or (math.nan, math.nan)
+    parts = [_SCENE.pack(
+        snapshot.player_pos[0], snapshot.player_pos[1], ret[0], ret[1], snapshot.l, snapshot.c,
+        int(snapshot.inventory_open),
+        ref(snapshot.scene_id), ref(snapshot.player_texture_path), ref(snapshot.active_dialog_npc_id),
+        ref(snapshot.text_mode), ref(snapshot.text), ref(snapshot.text_source_id), ref(snapshot.text_voice_path),
+        len(snapshot.objects), len(snapshot.clickables), len(snapshot.inventory),
+    )]
+    pairs: List[Pair] = []
+    for o in snapshot.objects + snapshot.clickables:
+        flags = o.solid | o.interactable << 1 | o.scale_texture_to_rect << 2
+        parts.append(_OBJECT.pack(
+            _KIND_NAMES.index(o.kind), *o.rect, o.z, flags,
+            ref(o.id), ref(o.name), ref(o.texture_path), ref(o.translation), ref(o.inventory_texture_path),
+            ref(o.voice_path), o.dialog_index, _NO_REWARD if o.reward is None else len(o.reward),
+        ))
+        pairs.extend(o.reward or ())
+    pairs.extend((item["word"], item["texture_path"]) for item in snapshot.inventory)
+    parts.extend(_PAIR.pack(ref(a), ref(b)) for a, b in pairs)
+
+    encoded = [s.encode("utf-8") for s in strings.index]
+    lengths = struct.pack(f"<{len(encoded)}I", *map(len, encoded))
+    payload = b"".join([lengths] + encoded + parts)
+    return _HEADER.pack(MAGIC, SNAPSHOT_VERSION, zlib.crc32(payload), len(encoded)) + payload
+
+
+def decode(data: bytes) -> SceneSnapshot:
+    """Parse ``encode`` output. Raises ``SnapshotError`` on foreign, newer or damaged data."""
+    try:
+        return _decode(memoryview(data))
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise SnapshotError(f"damaged snapshot: {e}") from None
+
+
+def _decode(data: memoryview) -> SceneSnapshot:
+    magic, version, crc, n = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError("not a snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"snapshot version {version}, expected {SNAPSHOT_VERSION}")
+    pos = _HEADER.size
+    if zlib.crc32(data[pos:]) != crc:
+        raise SnapshotError("checksum mismatch")
+    lengths = struct.unpack_from(f"<{n}I", data, pos)
+    pos += 4 * n
+    table: List[Optional[str]] = [None]
+    for length in lengths:
+        table.append(str(data[pos:pos + length], "utf-8"))
+        pos += length
+    if pos > len(data):
+        raise SnapshotError("truncated string table")
+
+    (px, py, rx, ry, l, c, flags, scene_id, texture, dialog_npc, mode, text, source, voice,
+     n_objects, n_clickables, n_items) = _SCENE.unpack_from(data, pos)
+    pos += _SCENE.size
+    if table[mode] not in _MODES or table[scene_id] is None:
+        raise SnapshotError("bad scene record")
+    _check_coords("player position", px, py)
+    if not math.isnan(rx):
+        _check_coords("return position", rx, ry)
+
+    objects = []
+    for kind, x1, y1, x2, y2, z, oflags, oid, name, otexture, translation, inv_texture, ovoice, dialog_index, \
+            n_rewards in _OBJECT.iter_unpack(data[pos:pos + _OBJECT.size * (n_objects + n_clickables)]):
+        _check_coords(f"rect of {table[oid]!r}", x1, y1, x2, y2)
+        if dialog_index < 0:
+            raise SnapshotError(f"bad dialog index of {table[oid]!r}")
+        objects.append((ObjectState(
+            table[oid], _KIND_NAMES[kind], (x1, y1, x2, y2), z, bool(oflags & 1), bool(oflags & 2), bool(oflags & 4),
+            table[name], table[otexture], dialog_index, None, table[translation], table[inv_texture], table[ovoice],
+        ), n_rewards))
+    if len(objects) != n_objects + n_clickables:
+        raise SnapshotError("truncated objects")
+    pos += _OBJECT.size * len(objects)
+
+    pairs = [(table[a], table[b]) for a, b in _PAIR.iter_unpack(data[pos:])]
+    i = 0
+    for state, n_rewards in objects:
+        if n_rewards != _NO_REWARD:
+            state.reward = pairs[i:i + n_rewards]
+            i += n_rewards
+    inventory = [{"word": word, "texture_path": path} for word, path in pairs[i:i + n_items]]
+    if i + n_items != len(pairs):
+        raise SnapshotError("bad reward or inventory records")
+
+    states = [s for s, _ in objects]
+    return SceneSnapshot(
+        scene_id=table[scene_id],
+        player_pos=(px, py),
+        return_pos=None if math.isnan(rx) else (rx, ry),
+        player_texture_path=table[texture],
+        l=l,
+        c=c,
+        inventory_open=bool(flags & 1),
+        active_dialog_npc_id=table[dialog_npc],
+        text_mode=table[mode],
+        text=table[text],
+        text_source_id=table[source],
+        text_voice_path=table[voice],
+        objects=states[:n_objects],
+        clickables=states[n_objects:],
+        inventory=inventory,
+    )
+
+
+def _check_coords(what: str, *values: float) -> None:
+    if not all(math.isfinite(v) and abs(v) <= COORD_LIMIT for v in values):
+        raise SnapshotError(f"bad {what}: {values}")
+
+
+def to_json(snapshot: SceneSnapshot) -> str:
+    """Readable export for debugging; not read back by the game."""
+    data = {"version": SNAPSHOT_VERSION, **dataclasses.asdict(snapshot)}
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+# ---------- saves ----------
+
+def save(scene: Scene) -> None:
+    """Autosave ``scene``: encode it here, write it on the background writer."""
+    data_helper.save_snapshot(encode(capture(scene)))
+
+
+def merge_inventories(saved: List[Dict[str, str]], snapshot: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """Union of the ``data.json`` inventory and the snapshot's.
+
+    Items are only ever added, so the longer list is the newer one. The
+    other list's items that it lacks are appended, which keeps words
+    collected after the last snapshot if the game was killed.
+    """
+    newer, older = (saved, snapshot) if len(saved) >= len(snapshot) else (snapshot, saved)
+    merged = [dict(item) for item in newer]
+    seen = {(item["word"], item["texture_path"]) for item in merged}
+    merged.extend(dict(item) for item in older if (item["word"], item["texture_path"]) not in seen)
+    return merged
+
+
+def resume(snapshot: SceneSnapshot, registry) -> Scene:
+    """Scene from ``snapshot``, inventory merged with the saved one.
+
+    ``registry`` (a ``SceneRegistry``) supplies the template.
+    """
+    scene = restore(snapshot, registry.get_scene(snapshot.scene_id, "reset"))
+    store = data_helper.get_inventory_store()
+    store.replace(merge_inventories(store.to_list(), snapshot.inventory))
+    return scene
+
+
+def read_saved(registry=None) -> Optional[SceneSnapshot]:
+    """The saved snapshot, or None if it is missing, unreadable or of an unknown scene."""
+    data = data_helper.load_snapshot()
+    if data is None:
+        return None
+    try:
+        snapshot = decode(data)
+    except SnapshotError as e:
+        print("snapshot ignored:", e)
+        return None
+    if registry is not None and snapshot.scene_id not in registry:
+        print("snapshot ignored: unknown scene", snapshot.scene_id)
+        return None
+    return snapshot
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Print a saved scene snapshot as JSON.")
+    parser.add_argument("path", nargs="?", default=data_helper.SNAPSHOT_PATH)
+    args = parser.parse_args(argv)
+    with open(args.path, "rb") as f:
+        data = f.read()
+    try:
+        print(to_json(decode(data)))
+    except SnapshotError as e:
+        print(f"{args.path}: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
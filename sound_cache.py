@@ -0,0 +1,38 @@
+"""Кэш звуков (озвучка реплик и слов).
+
+``pygame.mixer.Sound`` хранит весь звук в памяти в распакованном виде
+(PCM), поэтому кэш ограничен по байтам и вытесняет давно не звучавшие
+звуки (LRU, см. ``sprite_cache.SurfaceLRU``). Не вытесняются звуки, которые
+сейчас играют, и закреплённые (``set_pinned``) — обычно озвучка текущей
+сцены. Заполнять кэш можно из фоновых потоков: декодирование идёт вне
+блокировки.
+"""
+import pygame
+
+from sprite_cache import SurfaceLRU
+
+
+def sound_bytes(sound: pygame.mixer.Sound) -> int:
+    """Сколько байт PCM занимает звук в текущем формате микшера."""
+    init = pygame.mixer.get_init()
+    if init is None:
+        return 0
+    frequency, fmt, channels = init
+    return int(sound.get_length() * frequency) * channels * (abs(fmt) // 8)
+
+
+def _not_playing(sound: pygame.mixer.Sound) -> bool:
+    return sound.get_num_channels() == 0
+
+
+class SoundCache(SurfaceLRU):
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        super().__init__(max_bytes, size_of=sound_bytes, can_evict=_not_playing)
+
+    def get(self, path: str) -> pygame.mixer.Sound:
+        """Звук для ``path``: из кэша или декодированный с диска."""
+        sound = self._lookup(path)
+        if sound is None:
+            sound = pygame.mixer.Sound(path)
+            self._put(path, sound)
+        return sound
@@ -0,0 +1,70 @@
+"""Равномерная сетка для грубого отбора объектов по области (broad-phase).
+
+Объект попадает во все ячейки, которые пересекает его прямоугольник.
+Запрос возвращает кандидатов из ячеек, накрывающих область; точную
+проверку (пересечение, расстояние) делает вызывающий код.
+"""
+import math
+from typing import Dict, Generic, Iterator, List, Tuple, TypeVar
+
+T = TypeVar("T")
+Cell = Tuple[int, int]
+
+
+class SpatialGrid(Generic[T]):
+    def __init__(self, cell_size: float = 32.0):
+        self.cell_size = cell_size
+        self._cells: Dict[Cell, List[T]] = {}
+        # id(obj) -> (obj, занятые ячейки); сами объекты могут быть нехэшируемыми
+        self._entries: Dict[int, Tuple[T, List[Cell]]] = {}
+
+    def _cell_range(self, x1: float, y1: float, x2: float, y2: float) -> Iterator[Cell]:
+        cs = self.cell_size
+        # вырожденные прямоугольники (x2 < x1) тоже должны куда-то попасть
+        x1, x2 = min(x1, x2), max(x1, x2)
+        y1, y2 = min(y1, y2), max(y1, y2)
+        cx1, cy1 = math.floor(x1 / cs), math.floor(y1 / cs)
+        cx2, cy2 = math.floor(x2 / cs), math.floor(y2 / cs)
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                yield cx, cy
+
+    def insert(self, obj: T, x1: float, y1: float, x2: float, y2: float) -> None:
+        if id(obj) in self._entries:
+            self.remove(obj)
+        cells = list(self._cell_range(x1, y1, x2, y2))
+        for cell in cells:
+            self._cells.setdefault(cell, []).append(obj)
+        self._entries[id(obj)] = (obj, cells)
+
+    def remove(self, obj: T) -> None:
+        entry = self._entries.pop(id(obj), None)
+        if entry is None:
+            return
+        for cell in entry[1]:
+            bucket = self._cells[cell]
+            bucket[:] = [o for o in bucket if o is not obj]
+            if not bucket:
+                del self._cells[cell]
+
+    def __contains__(self, obj: T) -> bool:
+        return id(obj) in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def query(self, x1: float, y1: float, x2: float, y2: float) -> List[T]:
+        """Кандидаты, чьи ячейки пересекаются с областью (без повторов)."""
+        seen = set()
+        result = []
+        cells = self._cells
+        for cell in self._cell_range(x1, y1, x2, y2):
+            bucket = cells.get(cell)
+            if not bucket:
+                continue
+            for obj in bucket:
+                key = id(obj)
+                if key not in seen:
+                    seen.add(key)
+                    result.append(obj)
+        return result
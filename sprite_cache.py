@@ -0,0 +1,160 @@
+"""Кэш готовых к отрисовке спрайтов.
+
+Ключ — (путь к текстуре, размер в пикселях). Исходная картинка декодируется
+один раз, масштабированные варианты хранятся отдельно. Если для размера
+есть готовый вариант из ``asset_cache``, он загружается вместо оригинала.
+Декодированные PNG сохраняются в ``asset_cache/decoded`` как сырые пиксели
+(``raw_pixels``): следующий запуск игры отображает их через mmap без
+повторного декодирования. Вытеснение — LRU по
+суммарному объёму пикселей; закреплённые спрайты (текущей сцены) не
+вытесняются. Кэш можно наполнять из фоновых потоков
+(см. ``asset_preloader``): операции со словарём защищены блокировкой,
+декодирование и масштабирование идут вне её.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+import pygame
+
+from asset_cache import ASSET_CACHE, CACHE_DIR
+from raw_pixels import RawPixelCache, load_raw
+
+Size = Tuple[int, int]
+SpriteKey = Tuple[str, Optional[Size]]
+
+
+def surface_bytes(surface: pygame.Surface) -> int:
+    """Сколько байт занимают пиксели поверхности."""
+    w, h = surface.get_size()
+    return w * h * surface.get_bytesize()
+
+
+class SurfaceLRU:
+    """LRU с бюджетом по байтам и счётчиками попаданий/промахов.
+
+    По умолчанию хранит поверхности; для других значений (звуков) передаются
+    ``size_of`` — сколько байт занимает значение — и ``can_evict`` — можно ли
+    вытеснить его прямо сейчас (например, пока звук играет, нельзя).
+    """
+
+    def __init__(self, max_bytes: int, size_of: Callable[[Any], int] = surface_bytes,
+                 can_evict: Optional[Callable[[Any], bool]] = None):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes_used = 0
+        self._size_of = size_of
+        self._can_evict = can_evict
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        # размер считается один раз, при добавлении
+        self._sizes: Dict[Hashable, int] = {}
+        self._pinned: Set[Hashable] = set()
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            else:
+                self.misses += 1
+            return value
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Есть ли ``key`` в кэше (без учёта в статистике и без обновления LRU)."""
+        with self._lock:
+            return key in self._entries
+
+    def _put(self, key: Hashable, value: Any) -> None:
+        size = self._size_of(value)
+        with self._lock:
+            # два потока могли одновременно промахнуться по одному ключу
+            if self._entries.pop(key, None) is not None:
+                self.bytes_used -= self._sizes.pop(key)
+            self._entries[key] = value
+            self._sizes[key] = size
+            self.bytes_used += size
+            # самый свежий элемент не вытесняем, даже если он один больше бюджета
+            self._evict(keep=key)
+
+    def _evict(self, keep: Hashable) -> None:
+        for key in list(self._entries):
+            if self.bytes_used <= self.max_bytes:
+                break
+            if key == keep or key in self._pinned:
+                continue
+            if self._can_evict is not None and not self._can_evict(self._entries[key]):
+                continue
+            del self._entries[key]
+            self.bytes_used -= self._sizes.pop(key)
+
+    def set_pinned(self, keys: Iterable[Hashable]) -> None:
+        """Закрепить ровно эти ключи (например, спрайты новой сцены), сняв прежние.
+
+        Закреплённые элементы не вытесняются, даже если вместе они больше бюджета.
+        """
+        with self._lock:
+            self._pinned = set(keys)
+            self._evict(keep=next(reversed(self._entries), None))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.bytes_used = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes_used,
+                "pinned": len(self._pinned),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class SpriteCache(SurfaceLRU):
+    def __init__(self, max_bytes: int = 128 * 1024 * 1024):
+        super().__init__(max_bytes)
+
+    def get(self, path: str, size: Optional[Size] = None) -> pygame.Surface:
+        """Вернуть поверхность для ``path``; если задан ``size`` — масштабированную."""
+        key = (path, size)
+        surface = self._lookup(key)
+        if surface is not None:
+            return surface
+
+        # уже масштабированный вариант из asset_cache — оригинал не декодируем
+        prebuilt = ASSET_CACHE.lookup(path, size) if size is not None else None
+        surface = load_raw(prebuilt) if prebuilt is not None else None
+        if surface is None:
+            if size is None:
+                surface = self._load(path)
+            else:
+                surface = pygame.transform.scale(self.get(path), size)
+        self._put(key, surface)
+        return surface
+
+    def _load(self, path: str) -> pygame.Surface:
+        surface = RAW_CACHE.load(path)
+        if surface is not None:
+            return surface
+        surface = pygame.image.load(path)
+        # convert_alpha() возможен только после создания окна
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+            RAW_CACHE.store(path, surface)
+        return surface
+
+
+RAW_CACHE = RawPixelCache(os.path.join(CACHE_DIR, "decoded"))
+SPRITE_CACHE = SpriteCache()
+
+
+def get_sprite(path: str, size: Optional[Size] = None) -> pygame.Surface:
+    """Спрайт из общего кэша."""
+    return SPRITE_CACHE.get(path, size)
@@ -0,0 +1,10 @@
+from asset_cache import icon_sizes, wanted_variants
+
+
+def test_word_icons_get_variants_at_every_width():
+    wanted = wanted_variants([1920, 1366])
+    for width in (1920, 1366):
+        for size in icon_sizes(width):
+            # dog.png and cat.png are inventory pictures and dialog rewards
+            assert size in wanted["sprites/objects/dog.png"]
+            assert size in wanted["sprites/objects/cat.png"]
@@ -0,0 +1,48 @@
+import pygame
+import pytest
+
+from dialog_layout import DialogLayoutCache
+
+SCREEN = (640, 480)
+
+
+@pytest.fixture(scope="module")
+def fonts():
+    pygame.font.init()
+    return pygame.font.Font(None, 24), pygame.font.Font(None, 40)
+
+
+def _style(base_font, **changes):
+    style = dict(font=base_font, color=(255, 255, 255), box_height=80, max_line_width=600)
+    style.update(changes)
+    return style
+
+
+def test_same_text_is_laid_out_once(fonts):
+    cache = DialogLayoutCache()
+    first = cache.get("Привет, эт!", [], 0, SCREEN, **_style(fonts[0]))
+    assert cache.get("Привет, эт!", [], 0, SCREEN, **_style(fonts[0])) is first
+    assert cache.get("Привет, эт!", [], 1, SCREEN, **_style(fonts[0])) is not first
+
+
+@pytest.mark.parametrize("change", [dict(font=1), dict(color=(0, 0, 0)), dict(box_height=200),
+                                    dict(max_line_width=100)])
+def test_style_is_part_of_the_key(fonts, change):
+    cache = DialogLayoutCache()
+    if "font" in change:
+        change = dict(font=fonts[change["font"]])
+    base = cache.get("Одна и та же реплика", [], 0, SCREEN, **_style(fonts[0]))
+    other = cache.get("Одна и та же реплика", [], 0, SCREEN, **_style(fonts[0], **change))
+    assert other is not base
+    assert cache.get("Одна и та же реплика", [], 0, SCREEN, **_style(fonts[0])) is base
+
+
+def test_least_recently_used_layout_is_evicted(fonts):
+    cache = DialogLayoutCache(max_entries=2)
+    a = cache.get("a", [], 0, SCREEN, **_style(fonts[0]))
+    cache.get("b", [], 0, SCREEN, **_style(fonts[0]))
+    assert cache.get("a", [], 0, SCREEN, **_style(fonts[0])) is a  # "b" is now the oldest
+    cache.get("c", [], 0, SCREEN, **_style(fonts[0]))
+    assert len(cache._layouts) == 2
+    assert cache.get("a", [], 0, SCREEN, **_style(fonts[0])) is a
+    assert [key[0] for key in cache._layouts] == ["c", "a"]
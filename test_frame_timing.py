@@ -0,0 +1,92 @@
+import csv
+
+import pytest
+
+import frame_timing
+from frame_timing import FrameTimer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, ms):
+        self.now += ms / 1000.0
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(frame_timing.time, "perf_counter", clock)
+    return clock
+
+
+def _frame(timer, clock, a_ms, b_ms, idle_ms=0.0):
+    timer.begin_frame()
+    clock.advance(a_ms)
+    timer.mark("a")
+    clock.advance(b_ms)
+    timer.mark("b")
+    timer.end_frame()
+    clock.advance(idle_ms)
+
+
+def _timer(capacity=600):
+    timer = FrameTimer(phases=("a", "b"), capacity=capacity)
+    timer.enabled = True
+    return timer
+
+
+def test_disabled_timer_records_nothing(clock):
+    timer = FrameTimer(phases=("a", "b"))
+    _frame(timer, clock, 1.0, 2.0)
+    assert timer.frames() == [] and timer.summary() == {}
+
+
+def test_phases_and_frame_period_are_recorded(clock):
+    timer = _timer()
+    _frame(timer, clock, 1.0, 2.0, idle_ms=7.0)
+    _frame(timer, clock, 3.0, 4.0)
+    first, second = timer.frames()
+    assert first == pytest.approx([1.0, 2.0, 10.0])
+    # the period of the newest frame is known only when the next one begins
+    assert second == pytest.approx([3.0, 4.0, 0.0])
+
+
+def test_ring_buffer_keeps_the_newest_frames_in_order(clock):
+    timer = _timer(capacity=4)
+    for n in range(1, 11):
+        _frame(timer, clock, float(n), 0.0)
+    assert [row[0] for row in timer.frames()] == pytest.approx([7.0, 8.0, 9.0, 10.0])
+    timer.clear()
+    assert timer.frames() == []
+
+
+def test_summary_avg_percentiles_and_fps(clock):
+    timer = _timer()
+    for n in range(1, 101):
+        _frame(timer, clock, float(n), 1.0, idle_ms=19.0 - n % 2 * 2)
+    summary = timer.summary()
+    assert summary["a"] == pytest.approx({"avg": 50.5, "p95": 95.0, "p99": 99.0})
+    assert summary["b"] == pytest.approx({"avg": 1.0, "p95": 1.0, "p99": 1.0})
+    # the last frame has no period yet and is left out of "frame"
+    periods = sorted(n + 1.0 + 19.0 - n % 2 * 2 for n in range(1, 100))
+    assert summary["frame"]["avg"] == pytest.approx(sum(periods) / len(periods))
+    assert summary["frame"]["p99"] == pytest.approx(periods[98])  # ceil(99 * 0.99) - 1
+    assert summary["fps"]["avg"] == pytest.approx(1000.0 / summary["frame"]["avg"])
+
+
+def test_dump_csv(clock, tmp_path):
+    timer = _timer()
+    _frame(timer, clock, 1.5, 2.25, idle_ms=1.0)
+    _frame(timer, clock, 0.5, 0.5)
+    path = str(tmp_path / "frames.csv")
+    assert timer.dump_csv(path) == 2
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows == [["frame", "a", "b", "frame_ms"],
+                    ["0", "1.5000", "2.2500", "4.7500"],
+                    ["1", "0.5000", "0.5000", "0.0000"]]
@@ -0,0 +1,77 @@
+import random
+
+import pygame
+import pytest
+
+from layers import SceneLayers, screen_rect
+from scenes import scenes
+from sprite_cache import get_sprite
+
+SIZE = (496, 279)
+SCALE = 1.0
+
+
+@pytest.fixture(scope="module", autouse=True)
+def display():
+    pygame.display.init()
+    pygame.display.set_mode(SIZE, 0, 32)
+    yield
+    pygame.display.quit()
+
+
+def _blit(surface, records):
+    for r in records:
+        if r.texture_path is not None:
+            rect = screen_rect(r.rect, SCALE)
+            surface.blit(get_sprite(r.texture_path, rect.size), rect)
+
+
+def _reference(state):
+    """Everything sorted from scratch, as draw_frame did before the layers."""
+    surface = pygame.Surface(SIZE)
+    records = list(enumerate(state.objects)) + [(len(state.objects), state.player)]
+    _blit(surface, [r for _, r in sorted(records, key=lambda p: (p[1].z, p[1].rect.y2, p[0]))])
+    return pygame.image.tobytes(surface, "RGB")
+
+
+def _layered(layers, state):
+    layers.update(state)
+    surface = pygame.Surface(SIZE)
+    surface.blit(layers.background, (0, 0))
+    order = layers.draw_order(state.player)
+    keys = [(r.z, r.rect.y2) for r in order]
+    assert keys == sorted(keys)
+    _blit(surface, order)
+    return pygame.image.tobytes(surface, "RGB")
+
+
+@pytest.mark.parametrize("scene_id", ["scene1", "scene2", "scene3_house", "scene5"])
+def test_layers_draw_like_a_full_sort(scene_id):
+    rnd = random.Random(scene_id)
+    layers = SceneLayers(SIZE, SCALE)
+    scene = scenes.get_scene(scene_id, "fresh")
+    scene.player_texture_path = "sprites/bahtiyar/down0.png"
+    for y in range(0, 260, 13):
+        for x in (100, 240, 360, 380):
+            scene.player_pos = (x, y)
+            if rnd.random() < 0.3:
+                obj = rnd.choice(scene.objects)
+                obj.rect.move_ip(rnd.uniform(-20, 20), rnd.uniform(-20, 20))
+                scene.object_changed(obj)
+            state = scene.render_state()
+            assert _layered(layers, state) == _reference(state)
+
+
+def test_moved_foreground_objects_keep_the_dynamic_list_sorted():
+    layers = SceneLayers(SIZE, SCALE)
+    scene = scenes.get_scene("scene1", "fresh")
+    layers.update(scene.render_state())
+    rnd = random.Random(5)
+    movable = [o for o in scene.objects if o.interactable]  # the door and grandfather
+    for _ in range(50):
+        obj = rnd.choice(movable)
+        obj.rect.move_ip(0, rnd.uniform(-30, 30))
+        scene.object_changed(obj)
+        layers.update(scene.render_state())
+        assert layers._dynamic_keys == sorted(layers.order_key(r) for r in layers._dynamic)
+        assert layers._dynamic_keys == [layers.order_key(r) for r in layers._dynamic]
@@ -0,0 +1,80 @@
+import json
+import os
+import threading
+import time
+
+import data_helper
+
+from save_writer import SaveWriter, write_json_atomic
+
+
+class Recorder:
+    def __init__(self, fail_on=None, gate=None):
+        self.calls = []
+        self.fail_on = fail_on
+        self.gate = gate
+
+    def __call__(self, path, data):
+        if self.gate is not None:
+            self.gate.wait()
+        self.calls.append(data)
+        if data == self.fail_on:
+            raise RuntimeError("broken")
+
+
+def test_burst_of_saves_is_written_once():
+    write = Recorder()
+    writer = SaveWriter("unused", delay=0.05, write=write)
+    for i in range(100):
+        writer.submit({"n": i})
+    assert writer.flush(5.0)
+    assert write.calls == [{"n": 99}]
+    assert writer.writes == 1
+
+
+def test_flush_without_pending_saves_returns_at_once():
+    writer = SaveWriter("unused", write=Recorder())
+    assert writer.flush(0.0)
+
+
+def test_flush_times_out_while_the_write_is_stuck():
+    gate = threading.Event()
+    write = Recorder(gate=gate)
+    writer = SaveWriter("unused", delay=0.0, write=write)
+    writer.submit("data")
+    assert not writer.flush(0.05)
+    gate.set()
+    assert writer.flush(5.0)
+    assert write.calls == ["data"]
+
+
+def test_writer_survives_a_failing_write():
+    write = Recorder(fail_on="boom")
+    writer = SaveWriter("unused", delay=0.0, write=write)
+    writer.submit("boom")
+    assert writer.flush(5.0)
+    writer.submit("ok")
+    assert writer.flush(5.0)
+    assert write.calls == ["boom", "ok"]
+
+
+def test_flush_saves_shares_one_timeout_between_the_writers(monkeypatch):
+    gate = threading.Event()
+    for name in ("SAVE_WRITER", "SNAPSHOT_WRITER"):
+        writer = SaveWriter("unused", delay=0.0, write=Recorder(gate=gate))
+        writer.submit("data")
+        monkeypatch.setattr(data_helper, name, writer)
+    start = time.monotonic()
+    assert not data_helper.flush_saves(0.2)
+    assert time.monotonic() - start < 0.35
+    gate.set()
+    assert data_helper.flush_saves(5.0)
+
+
+def test_write_json_atomic_leaves_no_temporary_file(tmp_path):
+    path = str(tmp_path / "data.json")
+    write_json_atomic(path, {"scene": "scene2", "inventory": []})
+    write_json_atomic(path, {"scene": "scene3", "inventory": []})
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["scene"] == "scene3"
+    assert os.listdir(tmp_path) == ["data.json"]
@@ -0,0 +1,133 @@
+import json
+import os
+import shutil
+
+import pytest
+
+import scene_compiler
+import scenes
+from scene_compiler import SceneDataError, compile_scenes, load_bundle
+
+# What the hand-written scene factories built before the scenes moved to scene_data/.
+EXPECTED_OBJECTS = {
+    "scene1": ["bg", "house1", "house2", "door", "babay", "flower", "wall_house1", "wall_house2", "dog"],
+    "scene1_house": ["bg", "door_exit", "ebi", "cat"],
+    "scene2": ["bg", "house1", "house2", "flower", "babay_big", "babay", "wall_house1", "wall_house2", "dog"],
+    "scene3": ["bg", "house1", "house2", "door", "babay", "flower", "wall_house1", "wall_house2", "dog"],
+    "scene3_house": ["bg", "door_exit", "ebi", "cat"],
+    "scene4": ["bg", "ebi_big", "ebi", "cat"],
+    "scene5": ["bg", "house1", "house2", "door", "babay", "flower", "wall_house1", "wall_house2", "dog"],
+    "scene5_house": ["bg", "door_exit", "ebi", "cat"],
+    "scene6": ["bg", "house1", "house2", "babay", "flower_big", "wall_house1", "wall_house2", "dog"],
+    "scene7": ["bg", "house1", "house2", "door", "babay", "wall_house1", "wall_house2", "dog"],
+    "scene7_house": ["bg", "door_exit", "ebi", "cat"],
+    "scene8": ["bg", "ebi_big_final", "ebi", "cat"],
+    "scene9": ["bg", "house1", "house2", "door", "babay", "wall_house1", "wall_house2", "dog"],
+    "scene9_house": ["bg", "door_exit", "ebi", "cat"],
+}
+# interactable object -> the scene it leads to
+EXPECTED_TRANSITIONS = {
+    "scene1": {"door": "scene1_house", "babay": "scene2"},
+    "scene1_house": {"door_exit": "scene1"},
+    "scene2": {"babay_big": "scene3"},
+    "scene3": {"door": "scene3_house"},
+    "scene3_house": {"door_exit": "scene3", "ebi": "scene4"},
+    "scene4": {"ebi_big": "scene5_house"},
+    "scene5": {"door": "scene5_house", "flower": "scene6"},
+    "scene5_house": {"door_exit": "scene5"},
+    "scene6": {"flower_big": "scene7"},
+    "scene7": {"door": "scene7_house"},
+    "scene7_house": {"door_exit": "scene7", "ebi": "scene8"},
+    "scene8": {"ebi_big_final": "scene9_house"},
+    "scene9": {"door": "scene9_house"},
+    "scene9_house": {"door_exit": "scene9"},
+}
+EXPECTED_DIALOGS = {"scene2": "babay_big", "scene4": "ebi_big", "scene6": "flower_big", "scene8": "ebi_big_final"}
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    """A writable copy of scene_data/ without the compiled bundle."""
+    path = tmp_path / "scene_data"
+    shutil.copytree(scene_compiler.SOURCE_DIR, path, ignore=shutil.ignore_patterns("scenes.bundle"))
+    return str(path)
+
+
+def _edit(source_dir, name, change):
+    path = os.path.join(source_dir, name)
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    change(data)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+@pytest.mark.parametrize("scene_id", sorted(EXPECTED_OBJECTS))
+def test_built_scenes_match_the_old_factories(scene_id):
+    scene = scenes.scenes.get_scene(scene_id, "fresh")
+    assert scene.id == scene_id
+    assert [o.id for o in scene.objects] == EXPECTED_OBJECTS[scene_id]
+    transitions = {o.id: o.next_scene_factory().id for o in scene.objects if o.interactable}
+    assert transitions == EXPECTED_TRANSITIONS[scene_id]
+    assert scene._active_dialog_npc_id == EXPECTED_DIALOGS.get(scene_id)
+    assert len(scene.clickable_objects) == 1
+
+
+def test_walls_are_computed_like_make_wall():
+    objects = {o.id: o for o in scenes.scenes.get_scene("scene1", "fresh").objects}
+    wall = objects["wall_house1"]
+    assert (wall.rect.x1, wall.rect.y1, wall.rect.x2, wall.rect.y2) == (87, 152, 173, 174)
+    assert wall.solid and wall.z == -1
+    # house2 is too small for the insets; make_wall gave it an inverted rect that blocks nothing
+    wall = objects["wall_house2"]
+    assert (wall.rect.x1, wall.rect.y1, wall.rect.x2, wall.rect.y2) == (267, 87, 333, 85)
+
+
+def test_bundle_leaves_out_defaults():
+    bundle = compile_scenes()
+    door_exit = next(o for o in bundle["scenes"]["scene1_house"]["objects"] if o["id"] == "door_exit")
+    assert "solid" not in door_exit and "name" not in door_exit
+
+
+def test_bundle_is_rebuilt_when_a_source_changes(source_dir):
+    bundle_path = os.path.join(source_dir, "scenes.bundle")
+    assert load_bundle(bundle_path, source_dir)["scene1"]["player_pos"] == [230, 220]
+    _edit(source_dir, "scene1.json", lambda d: d.update(player_pos=[10, 20]))
+    assert load_bundle(bundle_path, source_dir)["scene1"]["player_pos"] == [10, 20]
+    with open(bundle_path, encoding="utf-8") as f:
+        assert json.load(f)["scenes"]["scene1"]["player_pos"] == [10, 20]
+
+
+def test_bundle_is_rebuilt_when_a_default_changes(source_dir, monkeypatch):
+    bundle_path = os.path.join(source_dir, "scenes.bundle")
+
+    def door_exit():
+        return next(o for o in load_bundle(bundle_path, source_dir)["scene1_house"]["objects"]
+                    if o["id"] == "door_exit")
+
+    assert door_exit()["z"] == -1
+    # the bundle leaves out values equal to the defaults, so it must follow them
+    defaults = dict(scene_compiler._OBJECT_DEFAULTS, static=dict(scene_compiler._OBJECT_DEFAULTS["static"], z=-1))
+    monkeypatch.setattr(scene_compiler, "_OBJECT_DEFAULTS", defaults)
+    assert "z" not in door_exit()
+    with open(bundle_path, encoding="utf-8") as f:
+        assert json.load(f)["code"] == scene_compiler.code_version()
+
+
+@pytest.mark.parametrize("name, change, message", [
+    ("scene1.json", lambda d: d.update(remove="door"), "remove must be a list"),
+    ("scene1.json", lambda d: d.update(colour="red"), "unknown keys"),
+    ("scene2.json", lambda d: d["objects"].append({"id": "wall_x", "solid": True}), "rect is required"),
+    ("scene2.json", lambda d: d["objects"].append({"id": "wall_x", "solid": True, "rect": [5, 5, 1, 1]}),
+     "bad rect"),
+    ("scene2.json", lambda d: d["objects"].append("house1"), "duplicate object id"),
+    ("scene2.json", lambda d: d["objects"][4].update(next_scene="scene99"), "is not a scene"),
+    ("scene2.json", lambda d: d.update(start_dialog="babay"), "is not an NPC"),
+    ("scene2.json", lambda d: d["objects"][4].update(texture_path="sprites/missing.png"), "missing file"),
+    ("scene1.json", lambda d: d.update(override={"nobody": {"z": 2}}), "unknown object"),
+    ("templates.json", lambda d: d["scenes"]["village"].update(extends="village_dialog"), "extend each other"),
+])
+def test_invalid_scene_data_is_rejected(source_dir, name, change, message):
+    _edit(source_dir, name, change)
+    with pytest.raises(SceneDataError, match=message):
+        compile_scenes(source_dir)
@@ -0,0 +1,39 @@
+from functools import partial
+
+from scene_registry import SceneRegistry
+from scenes import build_scene
+
+
+def _registry():
+    return SceneRegistry({scene_id: partial(build_scene, scene_id) for scene_id in ("scene1", "scene2")})
+
+
+def test_cached_returns_the_same_instance():
+    registry = _registry()
+    assert not registry.is_built("scene1")
+    assert registry.get_scene("scene1", "cached") is registry.get_scene("scene1", "cached")
+    assert registry.is_built("scene1") and not registry.is_built("scene2")
+
+
+def test_fresh_and_reset_return_new_instances():
+    registry = _registry()
+    assert registry.get_scene("scene1", "fresh") is not registry.get_scene("scene1", "fresh")
+    assert registry.get_scene("scene1", "reset") is not registry.get_scene("scene1", "reset")
+
+
+def test_reset_does_not_see_changes_to_the_cached_instance():
+    registry = _registry()
+    initial = registry.get_scene("scene1", "fresh").player_pos
+    registry.get_scene("scene1", "cached").player_pos = (1.0, 1.0)
+    assert registry.get_scene("scene1", "reset").player_pos == initial
+    registry.get_scene("scene1", "reset").player_pos = (2.0, 2.0)
+    assert registry.get_scene("scene1", "reset").player_pos == initial
+    assert registry.get_scene("scene1", "cached").player_pos == (1.0, 1.0)
+
+
+def test_reset_forgets_built_scenes():
+    registry = _registry()
+    cached = registry.get_scene("scene1", "cached")
+    registry.reset("scene1")
+    assert not registry.is_built("scene1")
+    assert registry.get_scene("scene1", "cached") is not cached
@@ -0,0 +1,95 @@
+import struct
+
+import pytest
+
+import data_helper
+import scene_snapshot
+from scene_snapshot import SnapshotError, capture, decode, encode, merge_inventories, restore, resume
+from scenes import scenes
+
+
+def _played_scene():
+    """scene1 after walking up to grandfather and collecting the dog."""
+    scene = scenes.get_scene("scene1", "fresh")
+    for _ in range(23):
+        scene.move_right()
+    for _ in range(11):
+        scene.move_forward()
+    scene.process_click(385, 178)
+    return scene
+
+
+def test_round_trip():
+    snapshot = capture(_played_scene())
+    assert decode(encode(snapshot)) == snapshot
+
+
+def test_restore_matches_captured_scene():
+    scene = _played_scene()
+    snapshot = decode(encode(capture(scene)))
+    restored = restore(snapshot, scenes.get_scene("scene1", "reset"))
+    assert capture(restored) == snapshot
+    assert restored.player_pos == scene.player_pos
+    assert [o.id for o in restored.clickable_objects] == [o.id for o in scene.clickable_objects]
+
+
+def test_restored_scene_plays_on_like_the_original():
+    scene = _played_scene()
+    restored = restore(decode(encode(capture(scene))), scenes.get_scene("scene1", "reset"))
+    for s in (scene, restored):
+        for _ in range(5):
+            s.move_left()
+    assert capture(restored) == capture(scene)
+
+
+def test_every_flipped_byte_is_rejected():
+    data = encode(capture(_played_scene()))
+    for i in range(len(data)):
+        damaged = bytearray(data)
+        damaged[i] ^= 0x40
+        with pytest.raises(SnapshotError):
+            decode(bytes(damaged))
+
+
+def test_truncated_data_is_rejected():
+    data = encode(capture(_played_scene()))
+    for n in range(len(data)):
+        with pytest.raises(SnapshotError):
+            decode(data[:n])
+
+
+@pytest.mark.parametrize("rect", [(-2.9e64, 0.0, 1.0, 1.0), (0.0, float("nan"), 1.0, 1.0),
+                                  (0.0, 0.0, float("inf"), 1.0)])
+def test_out_of_range_coordinates_are_rejected(rect):
+    # a checksum only catches damage, not a writer that produced nonsense
+    snapshot = capture(scenes.get_scene("scene1", "fresh"))
+    snapshot.objects[0].rect = rect
+    with pytest.raises(SnapshotError):
+        decode(encode(snapshot))
+
+
+def test_other_versions_are_rejected():
+    data = bytearray(encode(capture(scenes.get_scene("scene1", "fresh"))))
+    struct.pack_into("<H", data, 4, scene_snapshot.SNAPSHOT_VERSION + 1)
+    with pytest.raises(SnapshotError, match="version"):
+        decode(bytes(data))
+    with pytest.raises(SnapshotError, match="not a snapshot"):
+        decode(b"JUNK" + bytes(data[4:]))
+
+
+def test_merge_inventories_keeps_words_from_both():
+    a = {"word": "бабай", "texture_path": "a.png"}
+    b = {"word": "эт", "texture_path": "b.png"}
+    c = {"word": "песи", "texture_path": "c.png"}
+    assert merge_inventories([a, b], [a]) == [a, b]
+    assert merge_inventories([a], [a, b]) == [a, b]
+    assert merge_inventories([a, b], [a, c]) == [a, b, c]
+
+
+def test_resume_does_not_drop_words_collected_after_the_snapshot():
+    data_helper.use_memory_only([{"word": "бабай", "texture_path": "a.png"}])
+    snapshot = decode(encode(capture(scenes.get_scene("scene1", "fresh"))))
+    data_helper.add_inventory_item("эт", "b.png")  # saved to data.json, then the game is killed
+    scene = resume(snapshot, scenes)
+    assert scene.id == "scene1"
+    assert [i["word"] for i in data_helper.load_inventory()] == ["бабай", "эт"]
@@ -0,0 +1,42 @@
+import pygame
+import pytest
+
+from sound_cache import SoundCache, sound_bytes
+
+VOICE = "audios/babay/selem.ogg"
+OTHER = "audios/babay/min_babay.ogg"
+
+
+@pytest.fixture(scope="module", autouse=True)
+def mixer():
+    pygame.mixer.init()
+    yield
+    pygame.mixer.quit()
+
+
+def test_sounds_are_cached_by_path():
+    cache = SoundCache()
+    sound = cache.get(VOICE)
+    assert cache.get(VOICE) is sound
+    assert cache.bytes_used == sound_bytes(sound) > 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_playing_sounds_are_not_evicted():
+    cache = SoundCache(max_bytes=1)
+    channel = cache.get(VOICE).play()
+    try:
+        cache.get(OTHER)
+        assert VOICE in cache and OTHER in cache
+    finally:
+        channel.stop()
+    cache.set_pinned([])  # evicts again, keeping the newest
+    assert VOICE not in cache and OTHER in cache
+
+
+def test_stats_match_the_sprite_cache():
+    cache = SoundCache()
+    cache.get(VOICE)
+    cache.set_pinned([VOICE])
+    assert set(cache.stats()) == {"entries", "bytes", "pinned", "hits", "misses"}
+    assert cache.stats()["pinned"] == 1
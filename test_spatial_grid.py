@@ -0,0 +1,103 @@
+import math
+import random
+
+import pytest
+
+from object_store import HAVE_NUMPY
+from scene import ClickableObject, Rect, Scene, StaticObject, distance_point_to_rect
+from spatial_grid import SpatialGrid
+
+
+def _random_rects(rnd, n, extent=1000.0):
+    rects = []
+    for _ in range(n):
+        x, y = rnd.uniform(-extent, extent), rnd.uniform(-extent, extent)
+        rects.append(Rect(x, y, x + rnd.choice((0, 3, 17, 64, 150)), y + rnd.choice((0, 3, 17, 64, 150))))
+    return rects
+
+
+def _overlaps(r, x1, y1, x2, y2):
+    return r.x1 <= x2 and x1 <= r.x2 and r.y1 <= y2 and y1 <= r.y2
+
+
+@pytest.mark.parametrize("cell_size", [8.0, 32.0, 100.0])
+def test_query_finds_every_overlapping_rect_once(cell_size):
+    rnd = random.Random(cell_size)
+    rects = _random_rects(rnd, 500)
+    grid = SpatialGrid(cell_size)
+    for r in rects:
+        grid.insert(r, r.x1, r.y1, r.x2, r.y2)
+    for box in _random_rects(rnd, 200):
+        found = grid.query(box.x1, box.y1, box.x2, box.y2)
+        assert len(found) == len({id(r) for r in found})
+        expected = {id(r) for r in rects if _overlaps(r, box.x1, box.y1, box.x2, box.y2)}
+        assert expected <= {id(r) for r in found}
+
+
+def test_remove_and_reinsert():
+    grid = SpatialGrid(10.0)
+    r = Rect(0, 0, 25, 5)
+    grid.insert(r, r.x1, r.y1, r.x2, r.y2)
+    grid.insert(r, 100, 100, 105, 105)  # moved
+    assert len(grid) == 1
+    assert grid.query(0, 0, 25, 5) == []
+    assert grid.query(101, 101, 102, 102) == [r]
+    grid.remove(r)
+    assert r not in grid
+    assert grid.query(100, 100, 105, 105) == []
+
+
+def _random_scene(rnd, array_store_min_objects):
+    objects, clickables = [], []
+    for i, rect in enumerate(_random_rects(rnd, 300, extent=400.0)):
+        objects.append(StaticObject(id=f"o{i}", rect=rect, solid=rnd.random() < 0.5,
+                                    interactable=rnd.random() < 0.3))
+        clickables.append(ClickableObject(id=f"c{i}", rect=Rect(rect.x1, rect.y1, rect.x2, rect.y2)))
+    return Scene(id="random", objects=objects, player_pos=(0.0, 0.0), clickable_objects=clickables,
+                 interact_distance=40.0, array_store_min_objects=array_store_min_objects)
+
+
+def _brute_nearest(scene):
+    box = scene._player_rect()
+    best, best_d = None, math.inf
+    for o in scene.objects:
+        if not o.interactable:
+            continue
+        d = distance_point_to_rect(box.cx, box.cy, o.rect)
+        if d <= scene.interact_distance and d < best_d:
+            best, best_d = o, d
+    return best, best_d
+
+
+STORES = [pytest.param(10 ** 9, id="grid"),
+          pytest.param(0, id="numpy", marks=pytest.mark.skipif(not HAVE_NUMPY, reason="numpy not installed"))]
+
+
+@pytest.mark.parametrize("array_store_min_objects", STORES)
+def test_scene_queries_match_a_linear_scan(array_store_min_objects):
+    rnd = random.Random(7)
+    scene = _random_scene(rnd, array_store_min_objects)
+    assert (scene._arrays is not None) == (array_store_min_objects == 0)
+    for _ in range(300):
+        scene.player_pos = (rnd.uniform(-420, 420), rnd.uniform(-420, 420))
+        box = scene._player_rect()
+        dx, dy = rnd.choice((-4.0, 0.0, 4.0)), rnd.choice((-4.0, 0.0, 4.0))
+        solid = any(o.solid and box.intersects_moved(o.rect, dx, dy) for o in scene.objects)
+        assert scene._collides_with_solid(box, dx, dy) == solid
+        assert scene._nearest_interactable() == _brute_nearest(scene)
+        x, y = box.x1, box.y1
+        hit = next((c for c in scene.clickable_objects if c.rect.x1 <= x <= c.rect.x2 and c.rect.y1 <= y <= c.rect.y2),
+                   None)
+        assert scene._clickable_at(x, y) is hit
+
+
+@pytest.mark.parametrize("array_store_min_objects", STORES)
+def test_moved_objects_are_reindexed(array_store_min_objects):
+    scene = _random_scene(random.Random(3), array_store_min_objects)
+    wall = scene.objects[0]
+    wall.solid = True
+    wall.rect = Rect(5000, 5000, 5010, 5010)
+    scene.player_pos = (4995.0, 4995.0)
+    assert scene._collides_with_solid(scene._player_rect())
+    wall.rect = Rect(-5000, -5000, -4990, -4990)
+    assert not scene._collides_with_solid(scene._player_rect())
@@ -0,0 +1,58 @@
+import pygame
+
+from sprite_cache import SurfaceLRU, surface_bytes
+
+
+def _surface():
+    return pygame.Surface((10, 10), pygame.SRCALPHA)  # 400 bytes
+
+
+def test_least_recently_used_is_evicted_first():
+    cache = SurfaceLRU(max_bytes=3 * surface_bytes(_surface()))
+    for key in "abc":
+        cache._put(key, _surface())
+    assert cache._lookup("a") is not None  # "b" is now the oldest
+    cache._put("d", _surface())
+    assert "b" not in cache
+    assert all(key in cache for key in "acd")
+    assert cache.bytes_used == 3 * surface_bytes(_surface())
+
+
+def test_newest_entry_is_kept_even_over_budget():
+    cache = SurfaceLRU(max_bytes=10)
+    cache._put("a", _surface())
+    assert "a" in cache
+
+
+def test_pinned_entries_are_not_evicted():
+    cache = SurfaceLRU(max_bytes=2 * surface_bytes(_surface()))
+    cache._put("a", _surface())
+    cache._put("b", _surface())
+    cache.set_pinned(["a"])
+    cache._put("c", _surface())
+    assert "a" in cache and "b" not in cache
+    cache.set_pinned([])
+    cache._put("d", _surface())
+    assert "a" not in cache
+
+
+def test_hits_and_misses_are_counted():
+    cache = SurfaceLRU(max_bytes=1 << 20)
+    assert cache._lookup("a") is None
+    cache._put("a", _surface())
+    cache._lookup("a")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_custom_size_and_busy_entries_are_skipped():
+    busy = set()
+    cache = SurfaceLRU(max_bytes=10, size_of=len, can_evict=lambda value: value not in busy)
+    cache._put("a", "aaaa")
+    cache._put("b", "bbbb")
+    busy.add("aaaa")
+    cache._put("c", "cccc")  # "a" is busy, so "b" goes
+    assert "a" in cache and "b" not in cache and "c" in cache
+    assert cache.bytes_used == 8
+    busy.clear()
+    cache._put("d", "dddd")
+    assert "a" not in cache
@@ -0,0 +1,41 @@
+"""Кэш отрисованного текста.
+
+``Font.render`` растеризует строку заново при каждом вызове; здесь результат
+хранится в LRU с ограничением по байтам. Ключ — (шрифт, размер, текст, цвет,
+сглаживание, фон).
+"""
+from typing import Optional, Tuple
+
+import pygame
+
+from sprite_cache import SurfaceLRU
+
+Color = Tuple[int, ...]
+
+
+class TextCache(SurfaceLRU):
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        super().__init__(max_bytes)
+
+    def render(self, font: pygame.font.Font, text: str, color: Color,
+               antialias: bool = True, background: Optional[Color] = None) -> pygame.Surface:
+        """То же, что ``font.render``, но одинаковые запросы возвращают одну поверхность.
+
+        Возвращённую поверхность нельзя менять — она общая.
+        """
+        key = (font, font.get_height(), text, tuple(color), antialias,
+               tuple(background) if background is not None else None)
+        surface = self._lookup(key)
+        if surface is None:
+            surface = font.render(text, antialias, color, background)
+            self._put(key, surface)
+        return surface
+
+
+TEXT_CACHE = TextCache()
+
+
+def render_text(font: pygame.font.Font, text: str, color: Color,
+                antialias: bool = True, background: Optional[Color] = None) -> pygame.Surface:
+    """Текст из общего кэша."""
+    return TEXT_CACHE.render(font, text, color, antialias, background)